@@ -0,0 +1,177 @@
+"""
+_bbref.py — Shared basketball-reference page fetching for the stats scripts.
+
+Each per-game page is kept on disk under .cache/bbref/ together with the
+ETag / Last-Modified validators it was served with. Later runs send them back
+as If-None-Match / If-Modified-Since, so a season whose page has not changed
+(every closed season) costs a 304 and a local read instead of a full download.
+
+Requests go over one kept-alive HTTPS connection per thread, so repeat
+fetches skip the TCP and TLS handshakes, and ask for a gzip body (the HTML
+compresses roughly 5x). Throttling (429), 5xx responses and network errors are
+retried with exponential backoff, honouring Retry-After when the server sends
+one, so one transient failure doesn't sink a multi-season run.
+
+parse_cached() pickles a parser's result next to the page, keyed on a hash of
+the page and the parser's source, so an unchanged season skips the row loop.
+"""
+
+import gzip
+import hashlib
+import http.client
+import os
+import pickle
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from urllib.error import HTTPError
+
+from _json_cache import read_json, save_json
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / ".cache" / "bbref"
+
+BBREF_HOST = "www.basketball-reference.com"
+PER_GAME_PATH = "/leagues/NBA_{year}_per_game.html"
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+TIMEOUT = 15
+MAX_RETRIES = 4
+BACKOFF_FACTOR = 2.0  # seconds; doubles each retry (2, 4, 8, 16)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_local = threading.local()
+
+
+def _new_connection():
+    return http.client.HTTPSConnection(BBREF_HOST, timeout=TIMEOUT)
+
+
+def _get(path, headers):
+    """GET path on this thread's connection, reconnecting once if it went stale."""
+    for attempt in range(2):
+        conn = getattr(_local, "conn", None)
+        if conn is None:
+            conn = _local.conn = _new_connection()
+        try:
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()
+            if resp.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return resp, body
+        except (OSError, http.client.HTTPException) as e:
+            # The connection may be mid-response; never reuse it
+            conn.close()
+            _local.conn = None
+            # Only a dropped idle keep-alive connection is retried right away
+            stale = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+            if attempt or not stale:
+                raise
+
+
+def _retry_after(resp):
+    """Seconds the server asked us to wait, or None."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_with_retries(path, headers):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            resp, body = _get(path, headers)
+        except (OSError, http.client.HTTPException):
+            if attempt == MAX_RETRIES:
+                raise
+            delay = BACKOFF_FACTOR * 2 ** attempt
+        else:
+            if resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return resp, body
+            delay = _retry_after(resp)
+            if delay is None:
+                delay = BACKOFF_FACTOR * 2 ** attempt
+        time.sleep(delay)
+
+
+def _write_atomic(path, data):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _cache_paths(year):
+    return CACHE_DIR / f"bbref_{year}.html", CACHE_DIR / f"bbref_{year}.meta.json"
+
+
+@lru_cache(maxsize=8)
+def fetch_per_game(year):
+    """Return the per-game stats page HTML for a bbref season end year.
+
+    Memoized per process, so a second caller for the same season (or a retry
+    pass) reuses the page without another request.
+    """
+    body_path, meta_path = _cache_paths(year)
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+    if body_path.exists() and meta_path.exists():
+        meta = read_json(meta_path)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    path = PER_GAME_PATH.format(year=year)
+    resp, body = _get_with_retries(path, headers)
+    if resp.status == 304:
+        return body_path.read_bytes().decode("utf-8")
+    if resp.status != 200:
+        raise HTTPError(f"https://{BBREF_HOST}{path}", resp.status, resp.reason, resp.headers, None)
+    validators = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+
+    if validators["etag"] or validators["last_modified"]:
+        _write_atomic(body_path, body)
+        save_json(meta_path, validators)
+    return body.decode("utf-8")
+
+
+def parse_cached(html, parse, name):
+    """Return parse(html), reusing the result pickled under name if still valid.
+
+    The key hashes the page together with the source file defining parse, so
+    a new page or an edited parser both re-parse. It is stored as a plain
+    first line and compared before anything is unpickled.
+    """
+    digest = hashlib.sha1(html.encode("utf-8"))
+    digest.update(Path(sys.modules[parse.__module__].__file__).read_bytes())
+    key = digest.hexdigest().encode("ascii") + b"\n"
+
+    path = CACHE_DIR / f"{name}.pickle"
+    try:
+        with open(path, "rb") as f:
+            if f.readline() == key:
+                return pickle.load(f)
+    except Exception:
+        # Unreadable, truncated, or pickled against a class that has since
+        # moved or been renamed: treat it as a miss and re-parse
+        pass
+
+    result = parse(html)
+    _write_atomic(path, key + pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+    return result
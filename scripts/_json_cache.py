@@ -0,0 +1,76 @@
+"""
+_json_cache.py — Shared JSON load/save helpers for the pipeline scripts.
+
+Parsed documents are memoized on (path, mtime_ns), so a file read more than
+once in the same run (e.g. trades.json in audit_owners.py) is parsed once,
+and a file rewritten on disk is re-parsed automatically.
+
+Uses orjson when it is installed and falls back to stdlib json otherwise.
+
+Note: cached objects are shared between callers. A script that mutates a
+loaded document should write it back with save_json(), which clears the cache.
+"""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def parse_json(data):
+    """Parse JSON from bytes or str (e.g. an HTTP response body)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path):
+    """Parse a JSON file without caching (for large, read-once documents)."""
+    if HAS_ORJSON:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=32)
+def _load(path_str, mtime_ns):
+    return read_json(path_str)
+
+
+def load_json(path):
+    """Parse a JSON file, reusing the previous parse if it is unchanged."""
+    path = Path(path)
+    return _load(str(path), path.stat().st_mtime_ns)
+
+
+def save_json(path, obj, pretty=False):
+    """Write obj as UTF-8 JSON in one write and drop cached parses.
+
+    Output is compact unless pretty=True, which indents by 2 spaces. The
+    bytes go to a sibling .tmp file that is then renamed over path, so an
+    interrupted run never leaves a half-written file. Returns the number
+    of bytes written.
+    """
+    if HAS_ORJSON:
+        option = orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(obj, option=option)
+    else:
+        if pretty:
+            text = json.dumps(obj, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+        data = (text + "\n").encode("utf-8")
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    _load.cache_clear()
+    return len(data)
@@ -0,0 +1,29 @@
+"""
+_throttle.py — Shared request pacing for the Fantrax scripts.
+
+RateLimiter spaces request *starts* at least `interval` seconds apart, across
+every thread that shares it. Unlike a fixed sleep after each response, a slow
+response already counts toward the gap, so no extra idle time is added when
+latency exceeds the budget.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval or 0.0)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self):
+        """Block until this caller's slot comes up."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
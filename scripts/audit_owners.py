@@ -16,17 +16,21 @@ Output: scripts/mapping_audit.md
 import json
 import os
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _json_cache import load_json
+
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 DOCS_DATA = PROJECT_ROOT / "docs" / "data"
 
 # Canonical owner keys
-CANONICAL_OWNERS = {
+CANONICAL_OWNERS = frozenset({
     'Baden', 'Berke', 'Delaney', 'Gold', 'Green',
     'HaleTrager', 'Jowkar', 'Moss', 'Peterson', 'Zujewski',
-}
+})
 
 # All known team names -> owner
 TEAM_TO_OWNER = {
@@ -50,66 +54,99 @@ TEAM_TO_OWNER = {
 }
 
 # Known abbreviations that should resolve to canonical owners
-KNOWN_ABBREVS = {
+KNOWN_ABBREVS = frozenset({
     'TRAG', 'HALE', 'JOWK', 'DELA', 'GREEN', 'BERK', 'PETE', 'DIME',
     'MOSS', 'ZJEW', 'GOLD', 'KELL', 'VLAND', 'BADEN', 'FLAGGS',
-}
+})
+
+# JSON keys whose string values are checked against the maps above
+TEAM_KEYS = frozenset({'team', 'team_name', 'teamName'})
+ABBREV_KEYS = frozenset({'owner', 'team', 'team_name'})
+
+# Leading trade-item tokens that are positions or rounds, not owners
+POSITION_RE = re.compile(r'^(1st|2nd|PG|SG|SF|PF|C|PG/SG|SG/SF|SF/PF|PF/C)$')
+
+# Findings are (file, path, value, kind) tuples, only formatted into
+# report lines by format_finding()
+
 
-violations = []
-warnings = []
+def format_finding(finding):
+    """Render a buffered finding as a report line."""
+    filepath, path, value, kind = finding
+    where = '.'.join(map(str, path))
+    if kind == 'unknown_team':
+        return f"  [{filepath}] Unknown team name: '{value}' at {where}"
+    if kind == 'non_canonical_owner':
+        return f"  [{filepath}] Non-canonical owner: '{value}' at {where}"
+    if kind == 'raw_abbrev':
+        return f"  [{filepath}] Raw abbreviation '{value}' used as {path[-1]} at {where}"
+    # unknown_abbrev
+    return f"  [{filepath}] Unknown abbreviation in trade data: '{value}'"
 
 
 def check_json_file(filepath: Path):
-    """Scan a JSON file for mapping violations."""
+    """Scan a JSON file for mapping violations.
+
+    Walks the document with an explicit stack instead of recursion. Each
+    node's path is a tuple and is only joined for nodes that are reported.
+
+    Returns (violations, warnings) lists of findings.
+    """
+    violations = []
+    warnings = []
     try:
-        with open(filepath, encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(filepath)
     except (json.JSONDecodeError, UnicodeDecodeError):
-        return
+        return violations, warnings
 
-    rel_path = filepath.relative_to(PROJECT_ROOT)
-    scan_value(data, str(rel_path), [])
+    rel_path = str(filepath.relative_to(PROJECT_ROOT))
 
+    # Stack entries: (value, path tuple, key of value in its parent dict).
+    # Children are pushed in reverse so they pop in document order.
+    stack = [(data, (), None)]
+    while stack:
+        obj, path, key = stack.pop()
 
-def scan_value(obj, filepath, path):
-    """Recursively scan JSON values for team names and owner references."""
-    if isinstance(obj, dict):
-        for key, val in obj.items():
+        if isinstance(obj, str):
             # Check if key is "team" or "team_name" and value is a string
-            if key in ('team', 'team_name', 'teamName') and isinstance(val, str):
-                if val and val not in TEAM_TO_OWNER and val != '—':
-                    violations.append(f"  [{filepath}] Unknown team name: '{val}' at {'.'.join(path + [key])}")
+            if key in TEAM_KEYS:
+                if obj and obj not in TEAM_TO_OWNER and obj != '—':
+                    violations.append((rel_path, path, obj, 'unknown_team'))
 
             # Check if key is "owner" and value is not canonical
-            if key == 'owner' and isinstance(val, str):
-                if val and val not in CANONICAL_OWNERS and val not in TEAM_TO_OWNER:
+            elif key == 'owner':
+                if obj and obj not in CANONICAL_OWNERS and obj not in TEAM_TO_OWNER:
                     # Check if it looks like a display name (e.g., "Sam Baden")
-                    if not any(c in val for c in CANONICAL_OWNERS):
-                        warnings.append(f"  [{filepath}] Non-canonical owner: '{val}' at {'.'.join(path + [key])}")
+                    if not any(c in obj for c in CANONICAL_OWNERS):
+                        warnings.append((rel_path, path, obj, 'non_canonical_owner'))
+
+            # Check for raw abbreviations appearing as values in owner-related contexts
+            if key in ABBREV_KEYS:
+                stripped = obj.strip()
+                if stripped in KNOWN_ABBREVS:
+                    violations.append((rel_path, path, stripped, 'raw_abbrev'))
 
-            scan_value(val, filepath, path + [key])
+        elif isinstance(obj, dict):
+            for k, val in reversed(obj.items()):
+                stack.append((val, path + (k,), k))
 
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            scan_value(item, filepath, path + [str(i)])
+        elif isinstance(obj, list):
+            for i in range(len(obj) - 1, -1, -1):
+                stack.append((obj[i], path + (i,), None))
 
-    elif isinstance(obj, str):
-        # Check for raw abbreviations appearing as values in owner-related contexts
-        stripped = obj.strip()
-        if stripped in KNOWN_ABBREVS and len(path) > 0:
-            parent_key = path[-1] if path else ''
-            if parent_key in ('owner', 'team', 'team_name'):
-                violations.append(f"  [{filepath}] Raw abbreviation '{stripped}' used as {parent_key} at {'.'.join(path)}")
+    return violations, warnings
 
 
 def check_trades_owners():
-    """Check that trade give/get arrays use resolvable owner refs."""
+    """Check that trade give/get arrays use resolvable owner refs.
+
+    Returns a list of violation findings.
+    """
     trades_path = DOCS_DATA / "trades.json"
     if not trades_path.exists():
-        return
+        return []
 
-    with open(trades_path) as f:
-        trades = json.load(f)
+    trades = load_json(trades_path)
 
     if not isinstance(trades, list):
         trades = trades.get('trades', [])
@@ -128,12 +165,10 @@ def check_trades_owners():
                     # Check if it resolves
                     if abbrev not in KNOWN_ABBREVS and abbrev not in CANONICAL_OWNERS:
                         # It might be a position or round
-                        if not re.match(r'^(1st|2nd|PG|SG|SF|PF|C|PG/SG|SG/SF|SF/PF|PF/C)$', abbrev):
+                        if not POSITION_RE.match(abbrev):
                             unknown_abbrevs.add(abbrev)
 
-    if unknown_abbrevs:
-        for a in sorted(unknown_abbrevs):
-            violations.append(f"  [trades.json] Unknown abbreviation in trade data: '{a}'")
+    return [('trades.json', (), a, 'unknown_abbrev') for a in sorted(unknown_abbrevs)]
 
 
 def main():
@@ -141,43 +176,58 @@ def main():
     print()
 
     # Scan all JSON files in docs/data/
-    json_files = sorted(DOCS_DATA.glob("*.json"))
-    for filepath in json_files:
-        if filepath.name.startswith('.'):
-            continue
-        check_json_file(filepath)
+    with os.scandir(DOCS_DATA) as it:
+        json_files = sorted(
+            Path(e.path) for e in it
+            if e.name.endswith('.json') and not e.name.startswith('.') and e.is_file()
+        )
+
+    # Files are independent; scan them on a small thread pool and merge
+    # results in file order
+    violations = []
+    warnings = []
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(json_files)))) as ex:
+        for file_violations, file_warnings in ex.map(check_json_file, json_files):
+            violations.extend(file_violations)
+            warnings.extend(file_warnings)
 
     # Check trades specifically
-    check_trades_owners()
+    violations.extend(check_trades_owners())
+
+    # Drop repeated findings, keeping first-seen (document) order
+    unique_violations = list(dict.fromkeys(violations))
+    unique_warnings = list(dict.fromkeys(warnings))
 
     # Generate report
     report = ["# Owner Mapping Audit Report\n"]
     report.append(f"Files scanned: {len(json_files)}")
-    report.append(f"Violations: {len(violations)}")
-    report.append(f"Warnings: {len(warnings)}")
+    report.append(f"Violations: {len(unique_violations)}")
+    report.append(f"Warnings: {len(unique_warnings)}")
     report.append("")
 
-    if violations:
+    if unique_violations:
         report.append("## Violations")
-        for v in violations:
-            report.append(v)
+        report.extend(format_finding(v) for v in unique_violations)
         report.append("")
 
-    if warnings:
+    if unique_warnings:
         report.append("## Warnings")
-        for w in warnings:
-            report.append(w)
+        report.extend(format_finding(w) for w in unique_warnings)
         report.append("")
 
-    if not violations and not warnings:
+    if not unique_violations and not unique_warnings:
         report.append("## Result: CLEAN")
         report.append("No mapping violations or warnings found.")
         report.append("")
 
+    owner_to_teams = defaultdict(list)
+    for team, owner in TEAM_TO_OWNER.items():
+        owner_to_teams[owner].append(team)
+
     report.append("## Canonical Owners")
     for owner in sorted(CANONICAL_OWNERS):
-        teams = [t for t, o in TEAM_TO_OWNER.items() if o == owner]
-        report.append(f"  {owner}: {', '.join(sorted(teams))}")
+        teams = sorted(owner_to_teams[owner])
+        report.append(f"  {owner}: {', '.join(teams)}")
 
     report_text = "\n".join(report) + "\n"
 
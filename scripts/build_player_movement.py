@@ -7,14 +7,19 @@ of each player's dynasty ownership. Players not found in any trade are
 classified as "startup" acquisitions.
 
 Usage:
-    python3 scripts/build_player_movement.py
+    python3 scripts/build_player_movement.py            # compact JSON
+    python3 scripts/build_player_movement.py --pretty   # indented JSON
 """
 
-import json
+import argparse
 import re
 import unicodedata
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 
+from _json_cache import load_json, save_json
+
 ROOT = Path(__file__).resolve().parent.parent
 TRADES_PATH = ROOT / "docs" / "data" / "trades.json"
 ROSTER_PATH = ROOT / "docs" / "data" / "rosters_2025_26.json"
@@ -51,21 +56,47 @@ OWNERS_CANONICAL = {
     "HaleTrager", "Jowkar", "Moss", "Peterson", "Zujewski",
 }
 
+# Position tokens that can lead a trade item in place of an owner
+POSITION_RE = re.compile(r'^(?:PG|SG|SF|PF|C)(?:/(?:PG|SG|SF|PF|C))?$', re.I)
+
+# Round text ("1st round", "2nd rd") or the words pick/swap, in one scan
+PICK_RE = re.compile(r'(?:1st|2nd)\s*(?:round|rd)|pick|swap', re.I)
+
+
+# Case-insensitive abbrev / alt name / canonical name → canonical owner.
+# Earlier maps take precedence on key collisions.
+_OWNER_LOOKUP = {}
+for _mapping in (OWNER_ABBREVS, OWNER_ALT_NAMES, {o: o for o in OWNERS_CANONICAL}):
+    for _key, _owner in _mapping.items():
+        _OWNER_LOOKUP.setdefault(_key.casefold(), _owner)
 
+
+@lru_cache(maxsize=4096)
 def resolve_owner(abbrev_or_name):
-    if abbrev_or_name in OWNER_ABBREVS:
-        return OWNER_ABBREVS[abbrev_or_name]
-    if abbrev_or_name in OWNER_ALT_NAMES:
-        return OWNER_ALT_NAMES[abbrev_or_name]
-    if abbrev_or_name in OWNERS_CANONICAL:
-        return abbrev_or_name
-    return abbrev_or_name
+    return _OWNER_LOOKUP.get(abbrev_or_name.casefold(), abbrev_or_name)
+
+
+def _strip_marks(text):
+    nfkd = unicodedata.normalize("NFD", text)
+    return "".join(c for c in nfkd if unicodedata.category(c) != "Mn")
 
 
+# Precomposed Latin letters (U+00C0-U+017F) -> unaccented base letters
+_ACCENT_MAP = str.maketrans({
+    c: _strip_marks(c)
+    for c in map(chr, range(0xC0, 0x180))
+    if _strip_marks(c) != c
+})
+
+
+@lru_cache(maxsize=4096)
 def normalize(name):
     """Strip accents and lowercase for matching."""
-    nfkd = unicodedata.normalize("NFD", name)
-    return "".join(c for c in nfkd if unicodedata.category(c) != "Mn").lower().strip()
+    clean = name.translate(_ACCENT_MAP)
+    if not clean.isascii():
+        # Characters outside the table (or pre-decomposed input)
+        clean = _strip_marks(name)
+    return clean.lower().strip()
 
 
 def parse_trade_item(item_str):
@@ -73,6 +104,9 @@ def parse_trade_item(item_str):
     parts = item_str.strip().split()
     if not parts:
         return None, None
+    # A leading number or position can never be an owner
+    if parts[0].isdigit() or POSITION_RE.match(parts[0]):
+        return None, None
     owner = resolve_owner(parts[0])
     asset = " ".join(parts[1:])
     return owner, asset
@@ -80,16 +114,16 @@ def parse_trade_item(item_str):
 
 def is_pick(asset_name):
     """Check if an asset is a draft pick, not a player."""
-    lower = asset_name.lower()
-    return bool(re.search(r'(1st|2nd)\s*(round|rd)', lower) or
-                "pick" in lower or "swap" in lower)
+    return PICK_RE.search(asset_name) is not None
 
 
 def main():
-    with open(TRADES_PATH) as f:
-        trades = json.load(f)
-    with open(ROSTER_PATH) as f:
-        roster_data = json.load(f)
+    parser = argparse.ArgumentParser(description="Build player ownership history from trades + rosters")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    args = parser.parse_args()
+
+    trades = load_json(TRADES_PATH)
+    roster_data = load_json(ROSTER_PATH)
 
     teams = roster_data.get("teams", {})
 
@@ -99,14 +133,9 @@ def main():
         for player in team_data.get("players", []):
             rostered_players[player["name"]] = owner
 
-    # Build normalized name → original name lookup
-    norm_to_name = {}
-    for name in rostered_players:
-        norm_to_name[normalize(name)] = name
-
     # Scan all trades for player movements
     # trade_events[normalized_name] = [(season, date, from_owner, to_owner)]
-    trade_events = {}
+    trade_events = defaultdict(list)
 
     for trade in trades:
         season = trade.get("season", "")
@@ -130,24 +159,17 @@ def main():
         # In a trade: "give" items are being sent BY that owner
         # "get" items are being received BY that owner
         all_items = give_items + get_items
+        all_owners = {o for o, _ in all_items}
         for from_owner, player_name in all_items:
             norm = normalize(player_name)
 
             # Determine to_owner: the "other side" of the trade
             # The player is listed under from_owner, meaning from_owner is sending them
             # The receiver is any other owner in the trade
-            all_owners = set()
-            for o, _ in give_items:
-                all_owners.add(o)
-            for o, _ in get_items:
-                all_owners.add(o)
-
             to_owners = all_owners - {from_owner}
-            to_owner = list(to_owners)[0] if to_owners else None
+            to_owner = next(iter(to_owners), None)
 
             if to_owner:
-                if norm not in trade_events:
-                    trade_events[norm] = []
                 trade_events[norm].append({
                     "season": season,
                     "date": date,
@@ -209,8 +231,7 @@ def main():
     }
 
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(output, f, indent=2)
+    save_json(OUTPUT_PATH, output, pretty=args.pretty)
 
     print(f"Done! {len(result)} players processed")
     print(f"  Traded: {traded_count}")
@@ -15,14 +15,19 @@ Weighting:
   - Mixed: 60% players + 40% picks
 
 Usage:
-    python3 scripts/combine_trade_grades.py
+    python3 scripts/combine_trade_grades.py            # compact JSON
+    python3 scripts/combine_trade_grades.py --pretty   # indented JSON
 """
 
-import json
+import argparse
 import re
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from collections import defaultdict
 
+from _json_cache import load_json, save_json
+
 ROOT = Path(__file__).resolve().parent.parent
 DATA = ROOT / "docs" / "data"
 
@@ -39,6 +44,26 @@ PLAYER_GRADE_SCALE = [
     (float("-inf"), "F"),
 ]
 
+# GPA -> letter grade scale (midpoints between GRADE_GPA values)
+GPA_GRADE_SCALE = [
+    (4.15, "A+"),
+    (3.5, "A"),
+    (2.5, "B"),
+    (1.5, "C"),
+    (0.5, "D"),
+    (float("-inf"), "F"),
+]
+
+
+def _bisect_table(scale):
+    """Split a descending (threshold, grade) scale into ascending cuts + labels."""
+    ascending = scale[::-1]
+    return [t for t, _ in ascending[1:]], [g for _, g in ascending]
+
+
+_GPA_CUTS, _GPA_LABELS = _bisect_table(GPA_GRADE_SCALE)
+_DELTA_CUTS, _DELTA_LABELS = _bisect_table(PLAYER_GRADE_SCALE)
+
 # Owner name resolution (for parsing pick strings in received_picks)
 OWNER_MAP = {
     "TRAG": "HaleTrager", "HALE": "HaleTrager",
@@ -67,42 +92,38 @@ CANONICAL_OWNERS = [
     "HaleTrager", "Jowkar", "Moss", "Peterson", "Zujewski"
 ]
 
+# Pick-string patterns used by parse_pick_id_from_string
+_YEAR_RE = re.compile(r'(20\d{2})')
+_ROUND_RE = re.compile(r'(1st|2nd|first|second)', re.I)
+_STRIP_YEAR = re.compile(r'20\d{2}')
+_STRIP_ROUND = re.compile(r'(?:1st|2nd|first|second)\s*(?:round|rd)?', re.I)
+_STRIP_NUM = re.compile(r'#\d+\s*(?:overall)?', re.I)
+_STRIP_PARENS = re.compile(r'\(.*?\)')
+_STRIP_WORDS = re.compile(
+    r'\b(?:swap|rights?|pick|draft|if|it|doesn\'t|convey|with|the|frp|srp)\b', re.I)
+
+
+# Case-insensitive abbrev / name / canonical name → canonical owner.
+# Earlier maps take precedence on key collisions.
+_OWNER_LOOKUP = {}
+for _mapping in (OWNER_MAP, OWNER_NAME_MAP, {o: o for o in CANONICAL_OWNERS}):
+    for _key, _owner in _mapping.items():
+        _OWNER_LOOKUP.setdefault(_key.casefold(), _owner)
+
 
+@lru_cache(maxsize=4096)
 def resolve_owner(abbr):
-    up = abbr.upper()
-    if up in OWNER_MAP:
-        return OWNER_MAP[up]
-    low = abbr.lower()
-    if low in OWNER_NAME_MAP:
-        return OWNER_NAME_MAP[low]
-    for co in CANONICAL_OWNERS:
-        if co.lower() == low:
-            return co
-    return abbr
+    return _OWNER_LOOKUP.get(abbr.casefold(), abbr)
 
 
 def gpa_to_grade(gpa):
     """Convert GPA back to letter grade."""
-    if gpa >= 4.15:
-        return "A+"
-    elif gpa >= 3.5:
-        return "A"
-    elif gpa >= 2.5:
-        return "B"
-    elif gpa >= 1.5:
-        return "C"
-    elif gpa >= 0.5:
-        return "D"
-    else:
-        return "F"
+    return _GPA_LABELS[bisect_right(_GPA_CUTS, gpa)]
 
 
 def delta_to_grade(delta):
     """Convert FPts delta to letter grade."""
-    for threshold, grade in PLAYER_GRADE_SCALE:
-        if delta >= threshold:
-            return grade
-    return "F"
+    return _DELTA_LABELS[bisect_right(_DELTA_CUTS, delta)]
 
 
 def parse_pick_id_from_string(pick_str, trade_season=None):
@@ -114,14 +135,18 @@ def parse_pick_id_from_string(pick_str, trade_season=None):
     """
     s = pick_str.strip()
 
+    # Every pick string carries a 20xx year; skip the regexes when it can't
+    if '20' not in s:
+        return None
+
     # Extract year
-    year_match = re.search(r'(20\d{2})', s)
+    year_match = _YEAR_RE.search(s)
     if not year_match:
         return None
     year = int(year_match.group(1))
 
     # Extract round
-    round_match = re.search(r'(1st|2nd|first|second)', s, re.I)
+    round_match = _ROUND_RE.search(s)
     if not round_match:
         return None
     rtext = round_match.group(1).lower()
@@ -129,13 +154,11 @@ def parse_pick_id_from_string(pick_str, trade_season=None):
 
     # Extract owner name
     cleaned = s
-    cleaned = re.sub(r'20\d{2}', '', cleaned)
-    cleaned = re.sub(r'(?:1st|2nd|first|second)\s*(?:round|rd)?', '', cleaned, flags=re.I)
-    cleaned = re.sub(r'#\d+\s*(?:overall)?', '', cleaned, flags=re.I)
-    cleaned = re.sub(r'\(.*?\)', '', cleaned)
-    cleaned = re.sub(
-        r'\b(?:swap|rights?|pick|draft|if|it|doesn\'t|convey|with|the|frp|srp)\b',
-        '', cleaned, flags=re.I)
+    cleaned = _STRIP_YEAR.sub('', cleaned)
+    cleaned = _STRIP_ROUND.sub('', cleaned)
+    cleaned = _STRIP_NUM.sub('', cleaned)
+    cleaned = _STRIP_PARENS.sub('', cleaned)
+    cleaned = _STRIP_WORDS.sub('', cleaned)
     cleaned = cleaned.strip()
 
     words = [w.strip() for w in cleaned.split() if w.strip()]
@@ -153,13 +176,17 @@ def parse_pick_id_from_string(pick_str, trade_season=None):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Merge player + pick grades into final trade grades")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("COMBINE TRADE GRADES (Players 60% + Picks 40%)")
     print("=" * 60)
 
     # Load data
-    trade_grades = json.load(open(DATA / "trade_grades.json"))
-    pick_ledger = json.load(open(DATA / "pick_ledger.json"))
+    trade_grades = load_json(DATA / "trade_grades.json")
+    pick_ledger = load_json(DATA / "pick_ledger.json")
 
     picks = pick_ledger["picks"]
 
@@ -174,6 +201,10 @@ def main():
         "still_inc": 0,
     }
 
+    # Grade distribution and per-owner GPAs, accumulated as sides are graded
+    combined_dist = defaultdict(int)
+    owner_grades = defaultdict(list)
+
     # Process each trade
     for trade in trade_grades["trades"]:
         trade_idx = trade["trade_index"]
@@ -249,8 +280,13 @@ def main():
                 side["combined_gpa"] = None
                 side["grade_basis"] = "incomplete"
                 stats["still_inc"] += 1
+                combined_dist["INC"] += 1
                 continue
 
+            combined_dist[combined_grade] += 1
+            if side["combined_gpa"] is not None:
+                owner_grades[side["owner"]].append(side["combined_gpa"])
+
             # Track changes
             if old_grade == "INC" and combined_grade != "INC":
                 stats["now_graded"] += 1
@@ -290,24 +326,6 @@ def main():
         else:
             trade["summary"] = f"Partial data ({side_a['owner']}: {a_grade}, {side_b['owner']}: {b_grade})."
 
-    # Update combined grade distribution
-    combined_dist = defaultdict(int)
-    for trade in trade_grades["trades"]:
-        for side_key in ["side_a", "side_b"]:
-            g = trade[side_key].get("combined_grade", trade[side_key].get("grade", "INC"))
-            combined_dist[g] += 1
-
-    # Owner report cards with combined grades
-    owner_grades = defaultdict(list)
-    for trade in trade_grades["trades"]:
-        for side_key in ["side_a", "side_b"]:
-            side = trade[side_key]
-            owner = side["owner"]
-            grade = side.get("combined_grade", side.get("grade", "INC"))
-            gpa = side.get("combined_gpa")
-            if gpa is not None:
-                owner_grades[owner].append(gpa)
-
     # Update meta
     trade_grades["meta"]["combined_grade_distribution"] = dict(combined_dist)
     trade_grades["meta"]["methodology"] += " Combined: 60% player delta + 40% pick slot grade (mixed), 100% for player-only or pick-only."
@@ -335,8 +353,7 @@ def main():
     trade_grades["meta"]["owner_report_cards"] = owner_report
 
     # Save
-    with open(DATA / "trade_grades.json", "w") as f:
-        json.dump(trade_grades, f, indent=2)
+    save_json(DATA / "trade_grades.json", trade_grades, pretty=args.pretty)
 
     # Print results
     print(f"\n{'='*60}")
@@ -13,13 +13,21 @@ Uses the accurate Fantrax scoring formula:
   PTS + REB + AST*2 + STL*4 + BLK*4 + FGM*2 - FGA + FTM - FTA + 3PM - TO*2
 
 Usage:
-    python3 scripts/compute_trade_windows.py
+    python3 scripts/compute_trade_windows.py            # compact JSON
+    python3 scripts/compute_trade_windows.py --pretty   # indented JSON
 """
 
-import json
+import argparse
 import re
 import unicodedata
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+from _json_cache import load_json, read_json, save_json
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA = ROOT / "docs" / "data"
@@ -37,6 +45,18 @@ GRADE_SCALE = [
     (float("-inf"), "F"),
 ]
 
+# GRADE_SCALE as ascending cut points + labels for bisect_right
+_GRADE_CUTS = [t for t, _ in reversed(GRADE_SCALE[:-1])]
+_GRADE_LABELS = [g for _, g in reversed(GRADE_SCALE)]
+
+# Punctuation dropped by normalize() (periods, straight and curly apostrophes)
+_NORM_TABLE = str.maketrans("", "", ".'\u2018\u2019")
+# Name suffixes stripped by normalize(), checked in this order
+_NAME_SUFFIXES = (" jr", " iii", " ii", " iv", " sr")
+
+# "2023 1st" / "2024 2nd" style pick references
+_PICK_RE = re.compile(r"\d{4}\s+(?:1st|2nd)")
+
 OWNER_ABBREVS = {
     "BADEN": "Baden", "VLAND": "Baden", "SAM": "Baden", "VLAD": "Baden",
     "BERK": "Berke", "LOGAN": "Berke",
@@ -51,14 +71,13 @@ OWNER_ABBREVS = {
 }
 
 
+@lru_cache(maxsize=None)
 def normalize(name):
     nfkd = unicodedata.normalize("NFD", name)
     clean = "".join(c for c in nfkd if unicodedata.category(c) != "Mn").lower().strip()
-    clean = clean.replace("\u2019", "'").replace("\u2018", "'")
-    clean = clean.replace(".", "").replace("'", "")
-    for suffix in [" jr", " iii", " ii", " iv", " sr"]:
-        if clean.endswith(suffix):
-            clean = clean[: -len(suffix)]
+    clean = clean.translate(_NORM_TABLE)
+    for suffix in _NAME_SUFFIXES:
+        clean = clean.removesuffix(suffix)
     return clean.strip()
 
 
@@ -70,53 +89,291 @@ def next_season(season):
 
 
 def delta_to_grade(delta):
-    for threshold, grade in GRADE_SCALE:
-        if delta >= threshold:
-            return grade
-    return "F"
+    return _GRADE_LABELS[bisect_right(_GRADE_CUTS, delta)]
+
+
+class PlayerEntry(NamedTuple):
+    """One received player on a trade side (field order = JSON key order)."""
+    player: str
+    pre_fpg: Optional[float]
+    post_fpg: Optional[float]
+    delta: Optional[float]
+    pre_season: str
+    post_season: Optional[str]
+    gp_pre: int
+    gp_post: int
+    dynasty_rank: Optional[int]
+    status: str
+    injury_affected: bool
+
+
+def player_delta(pre_fpts, post_fpts, post_season):
+    """Apply the pre/post window rules to one player -> (delta, status).
+
+    delta is None when the player can't be graded yet.
+    """
+    if pre_fpts is not None and post_fpts is not None:
+        return round(post_fpts - pre_fpts, 1), "graded"
+    if pre_fpts is not None:
+        # Player disappeared post-trade (injury, retirement, left league)
+        if post_season:
+            return round(-pre_fpts * 0.5, 1), "no_post_data"
+        return None, "current_season"
+    if post_fpts is not None:
+        # Rookie or new to league
+        return round(post_fpts * 0.5, 1), "no_pre_data"
+    return None, "no_data"
+
+
+def classify_item(item):
+    """Split a trade item once -> (owner, asset, is_pick).
+
+    owner is None (and asset is the whole item) when the item doesn't start
+    with a known owner abbreviation.
+    """
+    head, sep, rest = item.partition(" ")
+    owner = OWNER_ABBREVS.get(head.upper()) if sep else None
+    if owner:
+        asset = rest.strip()
+        pick_text = rest.lower()
+    else:
+        asset = item
+        pick_text = item.lower()
+    # Plain substring checks first; the regex only runs for the rest
+    is_pick = ("round" in pick_text or "right to swap" in pick_text
+               or "swap rights" in pick_text or _PICK_RE.search(pick_text) is not None)
+    return owner, asset, is_pick
+
+
+def load_scoring_lookup(path):
+    """Read fantrax_scoring.json into norm_name -> {season -> season stats}.
+
+    Names that normalize to the same key are merged the way the old direct
+    lookup plus linear scan resolved them: the last such name's seasons
+    win, and any season it lacks comes from the first earlier name that has
+    it. The raw document is released on return.
+    """
+    scoring = read_json(path)
+    scoring_lookup = {}
+    last_seasons = {}
+    for name, seasons in scoring.items():
+        norm = normalize(name)
+        merged = scoring_lookup.setdefault(norm, {})
+        for season, row in seasons.items():
+            merged.setdefault(season, row)
+        last_seasons[norm] = seasons
+    for norm, seasons in last_seasons.items():
+        scoring_lookup[norm].update(seasons)
+    return scoring_lookup
+
+
+def load_hist_lookup(path):
+    """Read player_stats_historical.json into norm_name -> {season -> fpts_pg}.
+
+    Only FPts/game is kept; the full per-season stat rows are released on
+    return instead of living for the whole run.
+    """
+    historical = read_json(path)
+    hist_lookup = defaultdict(dict)
+    for season, players in historical.items():
+        for norm, stats in players.items():
+            fpts = stats.get("fpts_pg")
+            if fpts is not None:
+                hist_lookup[norm][season] = fpts
+    return dict(hist_lookup)
 
 
-def parse_owner(item):
-    parts = item.split(" ", 1)
-    if len(parts) < 2:
-        return None
-    return OWNER_ABBREVS.get(parts[0].upper())
+# Read-only lookups used by grade_side(). main() sets them in this process
+# and passes them to pool workers through the initializer.
+_STATS_BY = {}
+_RANK_MAP = {}
 
+# Above this many trades grading runs on a process pool; below it worker
+# startup costs more than the grading itself
+PARALLEL_MIN_TRADES = 500
 
-def parse_asset(item):
-    parts = item.split(" ", 1)
-    if len(parts) < 2:
-        return item
-    if parts[0].upper() in OWNER_ABBREVS:
-        return parts[1].strip()
-    return item
 
+def _init_lookups(stats_by, rank_map):
+    global _STATS_BY, _RANK_MAP
+    _STATS_BY = stats_by
+    _RANK_MAP = rank_map
 
-def is_pick(item):
-    lower = item.lower()
-    parts = lower.split(" ", 1)
-    if len(parts) > 1 and parts[0].upper() in OWNER_ABBREVS:
-        asset = parts[1]
+
+def grade_side(received_assets, gave_assets, owner, season, post_season):
+    """Grade one side of a trade from the (owner, asset, is_pick) tuples it received."""
+    players_received = []
+    picks_received = []
+    total_delta = 0
+    has_graded_player = False
+    fully_graded = 0
+    side_injury = False
+
+    for _, asset, item_is_pick in received_assets:
+        if item_is_pick:
+            picks_received.append(asset)
+            continue
+
+        player_name = asset
+        norm = normalize(player_name)
+        pre_fpts, gp_pre = _STATS_BY.get((norm, season), (None, 0))
+        if post_season:
+            post_fpts, gp_post = _STATS_BY.get((norm, post_season), (None, 0))
+        else:
+            post_fpts, gp_post = None, 0
+
+        delta, status = player_delta(pre_fpts, post_fpts, post_season)
+        player_entry = PlayerEntry(
+            player=player_name,
+            pre_fpg=pre_fpts,
+            post_fpg=post_fpts,
+            delta=delta,
+            pre_season=season,
+            post_season=post_season,
+            gp_pre=gp_pre,
+            gp_post=gp_post,
+            dynasty_rank=_RANK_MAP.get(norm),
+            status=status,
+            injury_affected=status == "no_post_data",
+        )
+
+        if delta is not None:
+            total_delta += delta
+            has_graded_player = True
+        if status == "graded":
+            fully_graded += 1
+        elif status == "no_post_data":
+            side_injury = True
+
+        players_received.append(player_entry)
+
+    total_delta = round(total_delta, 1)
+
+    if not has_graded_player and not picks_received:
+        grade = "INC"
+        grade_reason = "no gradeable data"
+        confidence = "incomplete"
+    elif not has_graded_player:
+        grade = "INC"
+        grade_reason = "pick-only trade"
+        confidence = "incomplete"
+    else:
+        grade = delta_to_grade(total_delta)
+        grade_reason = None
+        # Confidence based on data quality
+        total_players = len(players_received)
+        if total_players > 0 and fully_graded == total_players:
+            confidence = "high"
+        elif fully_graded > 0:
+            confidence = "medium"
+        else:
+            confidence = "low"
+
+    result = {
+        "owner": owner,
+        "gave": [asset for _, asset, _ in gave_assets],
+        "received": [asset for _, asset, _ in received_assets],
+        "received_players": players_received,
+        "received_picks": picks_received,
+        "received_delta": total_delta,
+        "grade": grade,
+        "confidence": confidence,
+        "injury_affected": side_injury,
+    }
+    if grade_reason:
+        result["grade_reason"] = grade_reason
+    return result
+
+
+def grade_trade(indexed_trade):
+    """Grade one (trade_index, trade) pair against the shared lookups."""
+    i, trade = indexed_trade
+    season = trade.get("season", "")
+    date = trade.get("date")
+    post_season = next_season(season)
+
+    # Split give/get into sides
+    # Classify each item once: (owner, asset, is_pick)
+    give_assets = [classify_item(item) for item in trade.get("give", [])]
+    get_assets = [classify_item(item) for item in trade.get("get", [])]
+
+    # Determine owners for each side
+    side_a_owner = next((o for o, _, _ in give_assets if o), "Unknown")
+    side_b_owner = next((o for o, _, _ in get_assets if o), "Unknown")
+
+    # Side A gave give_assets, received get_assets
+    # Side B gave get_assets, received give_assets
+    side_a = grade_side(get_assets, give_assets, side_a_owner, season, post_season)
+    side_b = grade_side(give_assets, get_assets, side_b_owner, season, post_season)
+
+    # Determine winner
+    if side_a["grade"] != "INC" and side_b["grade"] != "INC":
+        if side_a["received_delta"] > side_b["received_delta"]:
+            winner = side_a["owner"]
+            loser = side_b["owner"]
+        elif side_b["received_delta"] > side_a["received_delta"]:
+            winner = side_b["owner"]
+            loser = side_a["owner"]
+        else:
+            winner = "tie"
+            loser = "tie"
     else:
-        asset = lower
-    return bool(re.search(r"(round|\d{4}\s+(1st|2nd)|right to swap|swap rights)", asset))
+        winner = None
+        loser = None
+
+    # Summary sentence
+    if winner and winner != "tie":
+        best_player = ""
+        best_delta = -999
+        winner_side = side_a if side_a["owner"] == winner else side_b
+        for p in winner_side["received_players"]:
+            if p.delta is not None and p.delta > best_delta:
+                best_delta = p.delta
+                best_player = p.player
+        summary = f"{winner} won this trade"
+        if best_player:
+            summary += f", receiving {best_player} (+{best_delta} FPts/g)"
+        summary += f". {loser} got the short end."
+    elif winner == "tie":
+        summary = "Even trade — both sides came out roughly equal."
+    else:
+        summary = "Incomplete — not enough data to determine a winner."
+
+    # Confidence for entire trade
+    confs = [side_a.get("confidence", "incomplete"), side_b.get("confidence", "incomplete")]
+    if "incomplete" in confs:
+        grade_confidence = "incomplete"
+    elif all(c == "high" for c in confs):
+        grade_confidence = "high"
+    elif "low" in confs:
+        grade_confidence = "low"
+    else:
+        grade_confidence = "medium"
+
+    return {
+        "trade_index": i,
+        "season": season,
+        "date": date,
+        "side_a": side_a,
+        "side_b": side_b,
+        "pick_components": [],
+        "summary": summary,
+        "grade_confidence": grade_confidence,
+    }
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Compute pre/post trade windows and grade all trades")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    args = parser.parse_args()
+
     print("=== Compute Trade Windows + Grade Trades ===\n")
 
     # Load data
-    with open(DATA / "trades.json") as f:
-        trades = json.load(f)
-    with open(DATA / "fantrax_scoring.json") as f:
-        scoring = json.load(f)
-    with open(DATA / "player_stats_historical.json") as f:
-        historical = json.load(f)
+    trades = load_json(DATA / "trades.json")
 
     # Load rankings for dynasty rank
     try:
-        with open(DATA / "rankings.json") as f:
-            rankings_raw = json.load(f)
+        rankings_raw = load_json(DATA / "rankings.json")
         rankings_arr = rankings_raw if isinstance(rankings_raw, list) else rankings_raw.get("rankings", [])
         rank_map = {}
         for r in rankings_arr:
@@ -125,50 +382,21 @@ def main():
     except Exception:
         rank_map = {}
 
-    # Build normalized scoring lookup: norm_name -> {season -> fpts_pg}
-    scoring_lookup = {}
-    for name, seasons in scoring.items():
-        norm = normalize(name)
-        scoring_lookup[norm] = seasons
-
+    scoring_lookup = load_scoring_lookup(DATA / "fantrax_scoring.json")
     # Also build from historical stats as fallback
-    hist_lookup = {}
-    for season, players in historical.items():
-        for norm, stats in players.items():
-            if norm not in hist_lookup:
-                hist_lookup[norm] = {}
-            fpts = stats.get("fpts_pg")
-            if fpts is not None:
-                hist_lookup[norm][season] = fpts
-
-    def get_fpts(player_name, season):
-        """Get FPts/game for a player in a season. Try scoring data first, then historical."""
-        norm = normalize(player_name)
-
-        # Try fantrax_scoring.json first
-        if norm in scoring_lookup and season in scoring_lookup[norm]:
-            return scoring_lookup[norm][season].get("fpts_per_game")
-
-        # Try direct name match
-        for name, seasons in scoring.items():
-            if normalize(name) == norm and season in seasons:
-                return seasons[season].get("fpts_per_game")
-
-        # Try historical stats
-        if norm in hist_lookup and season in hist_lookup[norm]:
-            return hist_lookup[norm][season]
-
-        return None
-
-    def get_gp(player_name, season):
-        """Get games played for a player in a season."""
-        norm = normalize(player_name)
-        if norm in scoring_lookup and season in scoring_lookup[norm]:
-            return scoring_lookup[norm][season].get("gp", 0)
-        return 0
+    hist_lookup = load_hist_lookup(DATA / "player_stats_historical.json")
+
+    # Flatten both sources into (norm_name, season) -> (fpts_pg, gp).
+    # fantrax_scoring.json wins over historical stats; historical rows have no GP.
+    stats_by = {}
+    for norm, seasons in hist_lookup.items():
+        for season, fpts in seasons.items():
+            stats_by[(norm, season)] = (fpts, 0)
+    for norm, seasons in scoring_lookup.items():
+        for season, row in seasons.items():
+            stats_by[(norm, season)] = (row.get("fpts_per_game"), row.get("gp", 0))
 
     # Process each trade
-    graded_trades = []
     stats = {
         "total": len(trades),
         "graded": 0,
@@ -176,197 +404,20 @@ def main():
         "grade_distribution": {},
     }
 
-    for i, trade in enumerate(trades):
-        season = trade.get("season", "")
-        date = trade.get("date")
-        post_season = next_season(season)
-
-        # Split give/get into sides
-        give_items = trade.get("give", [])
-        get_items = trade.get("get", [])
-
-        # Determine owners for each side
-        side_a_owner = None
-        side_b_owner = None
-        for item in give_items:
-            o = parse_owner(item)
-            if o:
-                side_a_owner = o
-                break
-        for item in get_items:
-            o = parse_owner(item)
-            if o:
-                side_b_owner = o
-                break
-
-        if not side_a_owner:
-            side_a_owner = "Unknown"
-        if not side_b_owner:
-            side_b_owner = "Unknown"
-
-        # Side A gave give_items, received get_items
-        # Side B gave get_items, received give_items
-        def process_side(received_items, owner):
-            players_received = []
-            picks_received = []
-            total_delta = 0
-            has_graded_player = False
-
-            for item in received_items:
-                if is_pick(item):
-                    picks_received.append(parse_asset(item))
-                    continue
-
-                player_name = parse_asset(item)
-                pre_fpts = get_fpts(player_name, season)
-                post_fpts = get_fpts(player_name, post_season) if post_season else None
-
-                player_entry = {
-                    "player": player_name,
-                    "pre_fpg": pre_fpts,
-                    "post_fpg": post_fpts,
-                    "delta": None,
-                    "pre_season": season,
-                    "post_season": post_season,
-                    "gp_pre": get_gp(player_name, season),
-                    "gp_post": get_gp(player_name, post_season) if post_season else 0,
-                    "dynasty_rank": rank_map.get(normalize(player_name)),
-                    "status": "graded",
-                    "injury_affected": False,
-                }
-
-                if pre_fpts is not None and post_fpts is not None:
-                    delta = round(post_fpts - pre_fpts, 1)
-                    player_entry["delta"] = delta
-                    total_delta += delta
-                    has_graded_player = True
-                elif pre_fpts is not None and post_fpts is None:
-                    # Player disappeared post-trade (injury, retirement, left league)
-                    if post_season:
-                        player_entry["delta"] = round(-pre_fpts * 0.5, 1)
-                        player_entry["status"] = "no_post_data"
-                        player_entry["injury_affected"] = True
-                        total_delta += player_entry["delta"]
-                        has_graded_player = True
-                    else:
-                        player_entry["status"] = "current_season"
-                elif pre_fpts is None and post_fpts is not None:
-                    # Rookie or new to league
-                    player_entry["delta"] = round(post_fpts * 0.5, 1)
-                    player_entry["status"] = "no_pre_data"
-                    total_delta += player_entry["delta"]
-                    has_graded_player = True
-                else:
-                    player_entry["status"] = "no_data"
-
-                players_received.append(player_entry)
-
-            total_delta = round(total_delta, 1)
-
-            if not has_graded_player and not picks_received:
-                grade = "INC"
-                grade_reason = "no gradeable data"
-                confidence = "incomplete"
-            elif not has_graded_player:
-                grade = "INC"
-                grade_reason = "pick-only trade"
-                confidence = "incomplete"
-            else:
-                grade = delta_to_grade(total_delta)
-                grade_reason = None
-                # Confidence based on data quality
-                fully_graded = sum(1 for p in players_received if p["status"] == "graded")
-                total_players = len(players_received)
-                if total_players > 0 and fully_graded == total_players:
-                    confidence = "high"
-                elif fully_graded > 0:
-                    confidence = "medium"
-                else:
-                    confidence = "low"
-
-            result = {
-                "owner": owner,
-                "gave": [parse_asset(item) for item in (get_items if received_items is give_items else give_items)],
-                "received": [parse_asset(item) for item in received_items],
-                "received_players": players_received,
-                "received_picks": picks_received,
-                "received_delta": total_delta,
-                "grade": grade,
-                "confidence": confidence,
-                "injury_affected": any(p.get("injury_affected") for p in players_received),
-            }
-            if grade_reason:
-                result["grade_reason"] = grade_reason
-            return result
-
-        side_a = process_side(get_items, side_a_owner)
-        side_b = process_side(give_items, side_b_owner)
-
-        # Fix the gave/received for correct direction
-        side_a["gave"] = [parse_asset(item) for item in give_items]
-        side_a["received"] = [parse_asset(item) for item in get_items]
-        side_b["gave"] = [parse_asset(item) for item in get_items]
-        side_b["received"] = [parse_asset(item) for item in give_items]
-
-        # Determine winner
-        if side_a["grade"] != "INC" and side_b["grade"] != "INC":
-            if side_a["received_delta"] > side_b["received_delta"]:
-                winner = side_a["owner"]
-                loser = side_b["owner"]
-            elif side_b["received_delta"] > side_a["received_delta"]:
-                winner = side_b["owner"]
-                loser = side_a["owner"]
-            else:
-                winner = "tie"
-                loser = "tie"
-        else:
-            winner = None
-            loser = None
-
-        # Summary sentence
-        if winner and winner != "tie":
-            best_player = ""
-            best_delta = -999
-            winner_side = side_a if side_a["owner"] == winner else side_b
-            for p in winner_side["received_players"]:
-                if p.get("delta") is not None and p["delta"] > best_delta:
-                    best_delta = p["delta"]
-                    best_player = p["player"]
-            summary = f"{winner} won this trade"
-            if best_player:
-                summary += f", receiving {best_player} (+{best_delta} FPts/g)"
-            summary += f". {loser} got the short end."
-        elif winner == "tie":
-            summary = "Even trade — both sides came out roughly equal."
-        else:
-            summary = "Incomplete — not enough data to determine a winner."
-
-        # Confidence for entire trade
-        confs = [side_a.get("confidence", "incomplete"), side_b.get("confidence", "incomplete")]
-        if "incomplete" in confs:
-            grade_confidence = "incomplete"
-        elif all(c == "high" for c in confs):
-            grade_confidence = "high"
-        elif "low" in confs:
-            grade_confidence = "low"
-        else:
-            grade_confidence = "medium"
-
-        graded_trade = {
-            "trade_index": i,
-            "season": season,
-            "date": date,
-            "side_a": side_a,
-            "side_b": side_b,
-            "pick_components": [],
-            "summary": summary,
-            "grade_confidence": grade_confidence,
-        }
-
-        graded_trades.append(graded_trade)
-
-        # Track stats
-        for side in [side_a, side_b]:
+    # Trades are independent given the read-only lookups, so large
+    # histories are graded on a process pool
+    _init_lookups(stats_by, rank_map)
+    if len(trades) > PARALLEL_MIN_TRADES:
+        with ProcessPoolExecutor(initializer=_init_lookups, initargs=(stats_by, rank_map)) as ex:
+            graded_trades = list(ex.map(grade_trade, enumerate(trades), chunksize=32))
+    else:
+        graded_trades = [grade_trade(indexed) for indexed in enumerate(trades)]
+
+    # Track stats
+    for graded_trade in graded_trades:
+        for side in (graded_trade["side_a"], graded_trade["side_b"]):
+            # PlayerEntry tuples only become dicts for serialization
+            side["received_players"] = [p._asdict() for p in side["received_players"]]
             g = side["grade"]
             if g != "INC":
                 stats["grade_distribution"][g] = stats["grade_distribution"].get(g, 0) + 1
@@ -390,8 +441,7 @@ def main():
         "trades": graded_trades,
     }
 
-    with open(DATA / "trade_grades.json", "w") as f:
-        json.dump(output, f, indent=2)
+    save_json(DATA / "trade_grades.json", output, pretty=args.pretty)
 
     print(f"Total trades: {len(trades)}")
     print(f"Graded sides: {stats['graded']}")
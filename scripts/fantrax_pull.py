@@ -9,6 +9,8 @@ Usage:
     python scripts/fantrax_pull.py
     python scripts/fantrax_pull.py --season 2025-26
     python scripts/fantrax_pull.py --verbose
+    python scripts/fantrax_pull.py --pretty    # indented raw JSON
+    python scripts/fantrax_pull.py --skip-existing    # only fetch what is missing
 
 Requires: requests, pyyaml (pip install requests pyyaml)
 Auth: scripts/config.yaml with JSESSIONID + FX_RM cookies
@@ -16,16 +18,22 @@ Auth: scripts/config.yaml with JSESSIONID + FX_RM cookies
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from _json_cache import parse_json, read_json, save_json
+from _throttle import RateLimiter
 
 try:
     import yaml
@@ -46,6 +54,33 @@ ERROR_LOG = SCRIPT_DIR / "errors.log"
 BASE_URL = "https://www.fantrax.com/fxea/general"
 INTERNAL_API_URL = "https://www.fantrax.com/fxpa/req"
 
+# Keep-alive pool and retry policy for the Fantrax origin. The internal
+# POSTs are read-only queries, so they are safe to retry too.
+FANTRAX_ORIGIN = "https://www.fantrax.com"
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+# Browser headers for the internal API only; public GETs go out bare
+INTERNAL_HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "origin": FANTRAX_ORIGIN,
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+}
+
+# Fixed fields of every internal API request; refUrl and msgs vary per call
+PAYLOAD_TEMPLATE = {
+    "uiv": 3,
+    "dt": 2,
+    "at": 0,
+    "av": "0.0",
+    "tz": "America/New_York",
+    "v": "182.0.1",
+}
+
 LEAGUE_IDS = {
     "2022-23": "n7exgxhpl1ydddam",
     "2023-24": "tz7m8b61lhphjz9w",
@@ -92,6 +127,27 @@ PUBLIC_ENDPOINTS = [
     "getLeagueInfo",
 ]
 
+# Multi-MB public responses that no parser reads back: streamed to disk as
+# received instead of being decoded and re-encoded
+STREAMED_ENDPOINTS = frozenset({"getPlayerIds"})
+
+# pageError code Fantrax returns when the session cookies have expired
+AUTH_ERROR_CODE = "WARNING_NOT_LOGGED_IN"
+AUTH_ERROR_BYTES = AUTH_ERROR_CODE.encode()
+
+# Candidate standings cell names, in preference order. Each row is checked
+# against the full list, since the name used can differ from row to row.
+_W_KEYS = ("w", "wins")
+_L_KEYS = ("l", "losses")
+_T_KEYS = ("t", "ties")
+_FPTS_KEYS = ("fpts", "fp", "fantasyPoints", "totalFP")
+_PCT_KEYS = ("winPct", "pct", "win_pct")
+_STANDINGS_KEYS = _W_KEYS + _L_KEYS + _T_KEYS + _FPTS_KEYS + _PCT_KEYS
+
+# Thousands separators / percent signs stripped from standings cell values
+_STRIP_INT = str.maketrans("", "", ",")
+_STRIP_FLOAT = str.maketrans("", "", ",%")
+
 # Internal endpoints to try (POST, need auth)
 INTERNAL_METHODS = [
     "getStandings",
@@ -109,6 +165,11 @@ INTERNAL_METHODS = [
     "getWaiverWirePlayersPending",
 ]
 
+# Endpoints for one league are fetched concurrently; the work is network-bound.
+# Seasons overlap too, up to the size of the session's connection pool.
+ENDPOINT_WORKERS = 8
+HTTP_POOL_SIZE = 16
+
 # =============================================================================
 # LOGGING
 # =============================================================================
@@ -137,23 +198,35 @@ def log_error(msg: str):
 # =============================================================================
 
 class FantraxPuller:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, pretty: bool = False, skip_existing: bool = False):
         self.config = config
+        self.pretty = pretty
+        self.skip_existing = skip_existing
+        # Set on the first WARNING_NOT_LOGGED_IN; later internal calls are skipped
+        self._auth_failed = False
         self.session = requests.Session()
+        self.session.mount(FANTRAX_ORIGIN, HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=RETRY_POLICY))
+        self.limiter = RateLimiter(config.get("request_delay", 0.5))
         self.request_count = 0
-        self.results: Dict[str, Any] = {}  # season -> { endpoint -> data }
+        self._league_headers: Dict[str, Dict[str, str]] = {}
+        self._request_cookies = self._cookies()
+        self._count_lock = threading.Lock()
+        # season -> { endpoint -> raw file }. Responses are written through to
+        # disk as they arrive and re-read only by the parsers that need them.
+        self.results: Dict[str, Dict[str, Path]] = {}
         self.errors: List[str] = []
-        self.working_endpoints: List[str] = []
-        self.failed_endpoints: List[str] = []
+        self.working_endpoints: Set[str] = set()
+        self.failed_endpoints: Set[str] = set()
 
     def _headers(self, league_id: str) -> Dict[str, str]:
-        return {
-            "accept": "application/json, text/plain, */*",
-            "content-type": "text/plain",
-            "origin": "https://www.fantrax.com",
-            "referer": f"https://www.fantrax.com/fantasy/league/{league_id}/home",
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        }
+        # Built once per league; only content-type and referer are added
+        headers = self._league_headers.get(league_id)
+        if headers is None:
+            headers = self._league_headers[league_id] = INTERNAL_HEADERS | {
+                "content-type": "text/plain",
+                "referer": f"{FANTRAX_ORIGIN}/fantasy/league/{league_id}/home",
+            }
+        return headers
 
     def _cookies(self) -> Dict[str, str]:
         cookies = {}
@@ -163,34 +236,38 @@ class FantraxPuller:
             cookies["FX_RM"] = self.config["fx_rm"]
         return cookies
 
-    def _sleep(self):
-        delay = self.config.get("request_delay", 0.5)
-        if delay > 0:
-            time.sleep(delay)
-
     def _is_auth_error(self, data: Any) -> bool:
         if isinstance(data, dict):
-            if data.get("pageError", {}).get("code") == "WARNING_NOT_LOGGED_IN":
+            if data.get("pageError", {}).get("code") == AUTH_ERROR_CODE:
                 return True
             return any(self._is_auth_error(v) for v in data.values())
         elif isinstance(data, list):
             return any(self._is_auth_error(x) for x in data)
         return False
 
-    def public_get(self, endpoint: str, league_id: str) -> Optional[Dict]:
-        """GET request to public /fxea API."""
+    def _count_request(self):
+        with self._count_lock:
+            self.request_count += 1
+
+    def public_get(self, endpoint: str, league_id: str, dest: Optional[Path] = None) -> Optional[Any]:
+        """GET request to public /fxea API.
+
+        With dest, the body is streamed to that file in chunks and never
+        decoded; the path is returned in place of the parsed data.
+        """
         url = f"{BASE_URL}/{endpoint}"
         params = {"leagueId": league_id}
         if endpoint == "getPlayerIds":
             params["sport"] = "NBA"
 
-        self.request_count += 1
+        self._count_request()
         try:
+            self.limiter.wait()
+            if dest is not None:
+                return self._stream_to(dest, url, params)
             resp = self.session.get(url, params=params, timeout=30)
             resp.raise_for_status()
-            data = resp.json()
-            self._sleep()
-            return data
+            return parse_json(resp.content)
         except Exception as e:
             msg = f"Public {endpoint} failed for {league_id}: {e}"
             log.warning(msg)
@@ -198,80 +275,196 @@ class FantraxPuller:
             self.errors.append(msg)
             return None
 
+    def _stream_to(self, dest: Path, url: str, params: Dict) -> Path:
+        """Write the body to dest via a .part file, promoted only if it looks like JSON.
+
+        A 200 can still carry an HTML login/error page or a pageError; keeping
+        one would have --skip-existing reuse it on every later run.
+        """
+        part = dest.with_name(dest.name + ".part")
+        overlap = len(AUTH_ERROR_BYTES) - 1
+        first = b""
+        tail = b""
+        try:
+            with self.session.get(url, params=params, timeout=30, stream=True) as resp:
+                resp.raise_for_status()
+                with open(part, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=1 << 16):
+                        f.write(chunk)
+                        if not first:
+                            first = chunk.lstrip()[:1]
+                        # The code may straddle two chunks
+                        if AUTH_ERROR_BYTES in chunk or AUTH_ERROR_BYTES in tail + chunk[:overlap]:
+                            raise ValueError(f"{AUTH_ERROR_CODE} in {dest.name} response")
+                        tail = (tail + chunk)[-overlap:]
+            if not first:
+                raise ValueError(f"{dest.name} response is empty")
+            if first not in (b"{", b"["):
+                raise ValueError(f"{dest.name} response is not JSON (starts with {first!r})")
+            os.replace(part, dest)
+            return dest
+        finally:
+            part.unlink(missing_ok=True)
+
     def internal_post(self, method: str, league_id: str, extra_data: Dict = None) -> Optional[Dict]:
         """POST request to internal /fxpa API."""
+        return self._post_msgs(league_id, [{"method": method, "data": extra_data or {}}], method)
+
+    def internal_post_batch(self, methods: List[str], league_id: str) -> Dict[str, Optional[Dict]]:
+        """POST several internal methods in one request via the msgs array.
+
+        Returns {method: data}, each data shaped like a single-method
+        internal_post response. Methods whose entry comes back with an error,
+        or every method if the batch itself fails, are retried on their own
+        so one bad method can't spoil the rest.
+        """
+        msgs = [{"method": m, "data": {}} for m in methods]
+        data = self._post_msgs(league_id, msgs, f"batch of {len(methods)} methods")
+        if self._auth_failed:
+            return dict.fromkeys(methods)
+
+        batched: Dict[str, Dict] = {}
+        responses = data.get("responses", []) if data else []
+        if len(responses) == len(methods):
+            shared = {k: v for k, v in data.items() if k != "responses"}
+            for method, resp in zip(methods, responses):
+                if not (resp.get("errorCode") or resp.get("error")):
+                    batched[method] = shared | {"responses": [resp]}
+
+        return {
+            m: batched[m] if m in batched else self.internal_post(m, league_id)
+            for m in methods
+        }
+
+    def _post_msgs(self, league_id: str, msgs: List[Dict], label: str) -> Optional[Dict]:
+        if self._auth_failed:
+            # Cookies are known to be stale; every internal call would fail
+            return None
+
         url = f"{INTERNAL_API_URL}?leagueId={league_id}"
-        msg_data = extra_data or {}
-        payload = {
-            "uiv": 3,
-            "refUrl": f"https://www.fantrax.com/fantasy/league/{league_id}/home",
-            "dt": 2,
-            "at": 0,
-            "av": "0.0",
-            "tz": "America/New_York",
-            "v": "182.0.1",
-            "msgs": [{"method": method, "data": msg_data}],
+        payload = PAYLOAD_TEMPLATE | {
+            "refUrl": f"{FANTRAX_ORIGIN}/fantasy/league/{league_id}/home",
+            "msgs": msgs,
         }
 
-        self.request_count += 1
+        self._count_request()
         try:
+            self.limiter.wait()
             resp = self.session.post(
                 url,
                 headers=self._headers(league_id),
-                cookies=self._cookies(),
+                cookies=self._request_cookies,
                 json=payload,
                 timeout=30,
             )
             resp.raise_for_status()
-            data = resp.json()
-
-            if self._is_auth_error(data):
-                msg = f"Auth error on {method} for {league_id} — cookies expired"
-                log.error(msg)
-                log_error(msg)
-                self.errors.append(msg)
+            body = resp.content
+            data = parse_json(body)
+
+            # Only walk the response tree when the code appears at all
+            if AUTH_ERROR_BYTES in body and self._is_auth_error(data):
+                if not self._auth_failed:
+                    self._auth_failed = True
+                    msg = (f"Auth error on {label} for {league_id} — cookies expired. "
+                           "Refresh JSESSIONID/FX_RM in scripts/config.yaml; "
+                           "skipping all remaining internal requests.")
+                    log.error(msg)
+                    log_error(msg)
+                    self.errors.append(msg)
                 return None
 
-            self._sleep()
             return data
         except Exception as e:
-            msg = f"Internal {method} failed for {league_id}: {e}"
+            msg = f"Internal {label} failed for {league_id}: {e}"
             log.warning(msg)
             log_error(msg)
             self.errors.append(msg)
             return None
 
-    def pull_season(self, season: str, league_id: str):
-        """Pull all available data for a single season."""
-        log.info(f"\n{'='*60}")
-        log.info(f"Pulling data for {season} (league_id={league_id})")
-        log.info(f"{'='*60}")
+    def _save_raw(self, out_path: Path, data: Any) -> Path:
+        """Serialize one response once, write it, and log its size."""
+        size = save_json(out_path, data, pretty=self.pretty)
+        log.info("    -> Saved %s (%s bytes)", out_path.name, size)
+        return out_path
+
+    def _kept_raw(self, season_raw_dir: Path, endpoint: str) -> Optional[Path]:
+        """The raw file saved by an earlier run, if --skip-existing should reuse it."""
+        path = season_raw_dir / f"{endpoint}.json"
+        if self.skip_existing and path.exists() and path.stat().st_size > 0:
+            return path
+        return None
+
+    def _reuse_raw(self, season_data: Dict, path: Path, endpoint: str):
+        season_data[endpoint] = path
+        log.info("    -> Kept %s from an earlier run", path.name)
+        self.working_endpoints.add(endpoint)
+
+    def _submit_season(self, ex: ThreadPoolExecutor, season: str, league_id: str) -> Tuple[List[Optional[Future]], Optional[Future]]:
+        """Queue every public and internal endpoint for one league on ex.
+
+        Endpoints kept on disk under --skip-existing are not requested: their
+        public slot is None, and they are left out of the internal batch.
+        """
+        season_raw_dir = RAW_DIR / season.replace("-", "_")
+        season_raw_dir.mkdir(parents=True, exist_ok=True)
+        public_futs = [
+            None if self._kept_raw(season_raw_dir, e) else
+            ex.submit(self.public_get, e, league_id,
+                      season_raw_dir / f"{e}.json" if e in STREAMED_ENDPOINTS else None)
+            for e in PUBLIC_ENDPOINTS
+        ]
+        methods = [m for m in INTERNAL_METHODS if not self._kept_raw(season_raw_dir, m)]
+        internal_fut = ex.submit(self.internal_post_batch, methods, league_id) if methods else None
+        return public_futs, internal_fut
+
+    def pull_season(self, season: str, league_id: str, pending: Optional[Tuple[List[Optional[Future]], Optional[Future]]] = None):
+        """Pull all available data for a single season.
+
+        pending holds futures already queued by _submit_season (see pull_all);
+        without it the season's endpoints are fetched here.
+        """
+        log.info("\n%s", "=" * 60)
+        log.info("Pulling data for %s (league_id=%s)", season, league_id)
+        log.info("%s", "=" * 60)
 
         season_data = {}
         season_key = season.replace("-", "_")
         season_raw_dir = RAW_DIR / season_key
         season_raw_dir.mkdir(parents=True, exist_ok=True)
 
+        # Fan out every endpoint for this league at once, then handle the
+        # responses in the usual order so logs and saved files are unchanged
+        if pending is None:
+            with ThreadPoolExecutor(max_workers=ENDPOINT_WORKERS) as ex:
+                pending = self._submit_season(ex, season, league_id)
+        public_futs, internal_fut = pending
+
         # --- Public endpoints ---
-        for endpoint in PUBLIC_ENDPOINTS:
-            log.info(f"  [{season}] Public: {endpoint}...")
-            data = self.public_get(endpoint, league_id)
-            if data:
+        for endpoint, fut in zip(PUBLIC_ENDPOINTS, public_futs):
+            log.info("  [%s] Public: %s...", season, endpoint)
+            if fut is None:
+                self._reuse_raw(season_data, season_raw_dir / f"{endpoint}.json", endpoint)
+                continue
+            data = fut.result()
+            if isinstance(data, Path):
+                # Streamed straight to disk by public_get
                 season_data[endpoint] = data
-                out_path = season_raw_dir / f"{endpoint}.json"
-                with open(out_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                log.info(f"    -> Saved {out_path.name} ({len(json.dumps(data))} bytes)")
-                if endpoint not in self.working_endpoints:
-                    self.working_endpoints.append(endpoint)
+                log.info("    -> Saved %s (%s bytes)", data.name, data.stat().st_size)
+                self.working_endpoints.add(endpoint)
+            elif data:
+                season_data[endpoint] = self._save_raw(season_raw_dir / f"{endpoint}.json", data)
+                self.working_endpoints.add(endpoint)
             else:
-                if endpoint not in self.failed_endpoints:
-                    self.failed_endpoints.append(endpoint)
+                self.failed_endpoints.add(endpoint)
 
         # --- Internal endpoints ---
+        internal_data = internal_fut.result() if internal_fut else {}
         for method in INTERNAL_METHODS:
-            log.info(f"  [{season}] Internal: {method}...")
-            data = self.internal_post(method, league_id)
+            log.info("  [%s] Internal: %s...", season, method)
+            if method not in internal_data:
+                self._reuse_raw(season_data, season_raw_dir / f"{method}.json", method)
+                continue
+            data = internal_data[method]
             if data:
                 # Check if it has useful data (not just an empty response)
                 responses = data.get("responses", [])
@@ -283,27 +476,19 @@ class FantraxPuller:
                     err = resp.get("errorCode") or resp.get("error")
                     if err:
                         has_error = True
-                        log.info(f"    -> Error response: {err}")
+                        log.info("    -> Error response: %s", err)
 
                 if has_data and not has_error:
-                    season_data[method] = data
-                    out_path = season_raw_dir / f"{method}.json"
-                    with open(out_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, indent=2)
-                    log.info(f"    -> Saved {out_path.name} ({len(json.dumps(data))} bytes)")
-                    if method not in self.working_endpoints:
-                        self.working_endpoints.append(method)
+                    season_data[method] = self._save_raw(season_raw_dir / f"{method}.json", data)
+                    self.working_endpoints.add(method)
                 elif has_error:
-                    log.info(f"    -> Skipped (error response)")
-                    if method not in self.failed_endpoints:
-                        self.failed_endpoints.append(method)
+                    log.info("    -> Skipped (error response)")
+                    self.failed_endpoints.add(method)
                 else:
-                    log.info(f"    -> Skipped (empty data)")
-                    if method not in self.failed_endpoints:
-                        self.failed_endpoints.append(method)
+                    log.info("    -> Skipped (empty data)")
+                    self.failed_endpoints.add(method)
             else:
-                if method not in self.failed_endpoints:
-                    self.failed_endpoints.append(method)
+                self.failed_endpoints.add(method)
 
         self.results[season] = season_data
 
@@ -314,40 +499,59 @@ class FantraxPuller:
 
         RAW_DIR.mkdir(parents=True, exist_ok=True)
 
+        jobs = []
         for season in seasons:
             league_id = LEAGUE_IDS.get(season)
             if not league_id:
-                log.error(f"No league ID for season {season}")
+                log.error("No league ID for season %s", season)
                 continue
-            self.pull_season(season, league_id)
+            jobs.append((season, league_id))
+
+        # Queue every season's requests on one shared pool up front, then
+        # save each season in order on this thread as its responses land.
+        # Only workers touch request_count/errors; the endpoint lists and
+        # results are mutated here alone.
+        workers = max(1, min(HTTP_POOL_SIZE, ENDPOINT_WORKERS * len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            pending = [self._submit_season(ex, season, league_id) for season, league_id in jobs]
+            for (season, league_id), season_pending in zip(jobs, pending):
+                self.pull_season(season, league_id, season_pending)
 
         self._print_summary()
 
     def _print_summary(self):
-        log.info(f"\n{'='*60}")
+        log.info("\n%s", "=" * 60)
         log.info("PULL SUMMARY")
-        log.info(f"{'='*60}")
-        log.info(f"Total requests: {self.request_count}")
-        log.info(f"Working endpoints: {', '.join(self.working_endpoints) or 'none'}")
-        log.info(f"Failed endpoints: {', '.join(self.failed_endpoints) or 'none'}")
-        log.info(f"Errors: {len(self.errors)}")
+        log.info("%s", "=" * 60)
+        log.info("Total requests: %s", self.request_count)
+        log.info("Working endpoints: %s", ", ".join(sorted(self.working_endpoints)) or "none")
+        log.info("Failed endpoints: %s", ", ".join(sorted(self.failed_endpoints)) or "none")
+        log.info("Errors: %s", len(self.errors))
         for season, data in self.results.items():
-            log.info(f"  {season}: {len(data)} endpoints returned data")
+            log.info("  %s: %s endpoints returned data", season, len(data))
             for endpoint in data:
-                log.info(f"    - {endpoint}")
+                log.info("    - %s", endpoint)
 
     # =========================================================================
     # PARSERS
     # =========================================================================
 
+    def _read_saved(self, season_files: Dict[str, Path], *endpoints: str) -> Optional[Dict]:
+        """Load the first of endpoints saved this run for a season from its raw file."""
+        for endpoint in endpoints:
+            path = season_files.get(endpoint)
+            if path:
+                return read_json(path)
+        return None
+
     def parse_standings(self) -> Dict[str, List[Dict]]:
         """Parse standings from all seasons into structured format."""
         all_standings = {}
 
         for season, data in self.results.items():
-            standings_data = data.get("getStandings")
+            standings_data = self._read_saved(data, "getStandings")
             if not standings_data:
-                log.warning(f"No standings data for {season}")
+                log.warning("No standings data for %s", season)
                 continue
 
             responses = standings_data.get("responses", [])
@@ -366,7 +570,7 @@ class FantraxPuller:
                 rows = table_list[0].get("rows", []) if table_list else []
 
                 for row in rows:
-                    cells = row.get("cells", {})
+                    cells = _flatten_cells(row.get("cells", {}), _STANDINGS_KEYS)
                     team_id = row.get("fixedCells", {}).get("teamId", "")
 
                     # Get team name from fantasyTeamInfo
@@ -379,11 +583,11 @@ class FantraxPuller:
 
                     # Parse W/L/T and fantasy points from cells
                     # The structure varies — try common patterns
-                    w = self._extract_cell_int(cells, "w", "wins")
-                    l = self._extract_cell_int(cells, "l", "losses")
-                    t = self._extract_cell_int(cells, "t", "ties")
-                    fpts = self._extract_cell_float(cells, "fpts", "fp", "fantasyPoints", "totalFP")
-                    win_pct = self._extract_cell_float(cells, "winPct", "pct", "win_pct")
+                    w = self._extract_cell_int(cells, *_W_KEYS)
+                    l = self._extract_cell_int(cells, *_L_KEYS)
+                    t = self._extract_cell_int(cells, *_T_KEYS)
+                    fpts = self._extract_cell_float(cells, *_FPTS_KEYS)
+                    win_pct = self._extract_cell_float(cells, *_PCT_KEYS)
 
                     # Rank from row position
                     rank_val = row.get("rank", len(standings) + 1)
@@ -408,32 +612,26 @@ class FantraxPuller:
             # Sort by rank
             standings.sort(key=lambda x: x.get("rank", 99))
             all_standings[season] = standings
-            log.info(f"  Parsed {len(standings)} teams for {season} standings")
+            log.info("  Parsed %s teams for %s standings", len(standings), season)
 
         return all_standings
 
     def _extract_cell_int(self, cells: Dict, *keys: str) -> int:
-        """Extract integer value from cells dict, trying multiple key names."""
+        """Extract integer value from flattened cells, trying multiple key names."""
         for key in keys:
             if key in cells:
-                val = cells[key]
-                if isinstance(val, dict):
-                    val = val.get("content", val.get("value", 0))
                 try:
-                    return int(float(str(val).replace(",", "")))
+                    return int(float(str(cells[key]).translate(_STRIP_INT)))
                 except (ValueError, TypeError):
                     pass
         return 0
 
     def _extract_cell_float(self, cells: Dict, *keys: str) -> float:
-        """Extract float value from cells dict, trying multiple key names."""
+        """Extract float value from flattened cells, trying multiple key names."""
         for key in keys:
             if key in cells:
-                val = cells[key]
-                if isinstance(val, dict):
-                    val = val.get("content", val.get("value", 0))
                 try:
-                    return float(str(val).replace(",", "").replace("%", ""))
+                    return float(str(cells[key]).translate(_STRIP_FLOAT))
                 except (ValueError, TypeError):
                     pass
         return 0.0
@@ -443,9 +641,9 @@ class FantraxPuller:
         all_transactions = {}
 
         for season, data in self.results.items():
-            trans_data = data.get("getTransactionLog") or data.get("getTransactions")
+            trans_data = self._read_saved(data, "getTransactionLog", "getTransactions")
             if not trans_data:
-                log.info(f"No transaction data for {season}")
+                log.info("No transaction data for %s", season)
                 continue
 
             responses = trans_data.get("responses", [])
@@ -454,7 +652,7 @@ class FantraxPuller:
 
             resp_data = responses[0].get("data", {})
             all_transactions[season] = resp_data
-            log.info(f"  Got transaction data for {season}")
+            log.info("  Got transaction data for %s", season)
 
         return all_transactions
 
@@ -463,9 +661,9 @@ class FantraxPuller:
         all_matchups = {}
 
         for season, data in self.results.items():
-            matchup_data = data.get("getScoreboard") or data.get("getMatchupScores") or data.get("getSchedule")
+            matchup_data = self._read_saved(data, "getScoreboard", "getMatchupScores", "getSchedule")
             if not matchup_data:
-                log.info(f"No matchup data for {season}")
+                log.info("No matchup data for %s", season)
                 continue
 
             responses = matchup_data.get("responses", [])
@@ -474,11 +672,21 @@ class FantraxPuller:
 
             resp_data = responses[0].get("data", {})
             all_matchups[season] = resp_data
-            log.info(f"  Got matchup data for {season}")
+            log.info("  Got matchup data for %s", season)
 
         return all_matchups
 
 
+def _flatten_cells(cells: Dict, keys: Tuple[str, ...]) -> Dict:
+    """Unwrap {"content"/"value": ...} cell objects for the given keys, once per row."""
+    flat = {}
+    for k in keys:
+        if k in cells:
+            val = cells[k]
+            flat[k] = val.get("content", val.get("value", 0)) if isinstance(val, dict) else val
+    return flat
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -501,6 +709,9 @@ def main():
     parser = argparse.ArgumentParser(description="Comprehensive Fantrax data puller")
     parser.add_argument("--season", default=None, help="Pull only this season (e.g. 2025-26)")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    parser.add_argument("--skip-existing", action="store_true",
+                        help="Reuse raw responses saved by an earlier run instead of re-fetching them")
     args = parser.parse_args()
 
     setup_logging(args.verbose)
@@ -514,22 +725,21 @@ def main():
         log.error("No JSESSIONID in config.yaml. Update scripts/config.yaml with fresh cookies.")
         sys.exit(1)
 
-    puller = FantraxPuller(config)
+    puller = FantraxPuller(config, pretty=args.pretty, skip_existing=args.skip_existing)
 
     seasons = [args.season] if args.season else None
     puller.pull_all(seasons)
 
     # Save endpoint discovery results
     discovery = {
-        "working": puller.working_endpoints,
-        "failed": puller.failed_endpoints,
+        "working": sorted(puller.working_endpoints),
+        "failed": sorted(puller.failed_endpoints),
         "total_requests": puller.request_count,
         "errors_count": len(puller.errors),
     }
     disc_path = RAW_DIR / "endpoint_discovery.json"
-    with open(disc_path, "w", encoding="utf-8") as f:
-        json.dump(discovery, f, indent=2)
-    log.info(f"\nEndpoint discovery saved to {disc_path}")
+    save_json(disc_path, discovery, pretty=args.pretty)
+    log.info("\nEndpoint discovery saved to %s", disc_path)
 
     return puller
 
@@ -9,6 +9,7 @@ Usage:
     python scripts/fantrax_yk.py
     python scripts/fantrax_yk.py --season 2025-26
     python scripts/fantrax_yk.py --all-seasons
+    python scripts/fantrax_yk.py --pretty    # indented JSON output
 
 Auth:
     Copy scripts/config.yaml.example to scripts/config.yaml and fill in
@@ -23,11 +24,15 @@ import json
 import logging
 import os
 import sys
-import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from _json_cache import parse_json, save_json
+from _throttle import RateLimiter
 
 try:
     import yaml
@@ -42,6 +47,33 @@ except ImportError:
 BASE_URL = "https://www.fantrax.com/fxea/general"
 INTERNAL_API_URL = "https://www.fantrax.com/fxpa/req"
 
+# Keep-alive pool and retry policy for the Fantrax origin. The internal
+# POSTs are read-only queries, so they are safe to retry too.
+FANTRAX_ORIGIN = "https://www.fantrax.com"
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+# Browser headers for the internal API only; public GETs go out bare
+INTERNAL_HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "origin": FANTRAX_ORIGIN,
+    "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+}
+
+# Fixed fields of every internal API request; refUrl and msgs vary per call
+PAYLOAD_TEMPLATE = {
+    "uiv": 3,
+    "dt": 2,
+    "at": 0,
+    "av": "0.0",
+    "tz": "America/New_York",
+    "v": "182.0.1",
+}
+
 # YK Dynasty league IDs by season
 LEAGUE_IDS = {
     "2022-23": "n7exgxhpl1ydddam",
@@ -50,6 +82,10 @@ LEAGUE_IDS = {
     "2025-26": "sz7vm5xwmancf4tr",
 }
 
+# pageError code Fantrax returns when the session cookies have expired
+AUTH_ERROR_CODE = "WARNING_NOT_LOGGED_IN"
+AUTH_ERROR_BYTES = AUTH_ERROR_CODE.encode()
+
 # Owner mapping: Fantrax username → canonical owner key
 FANTRAX_TO_OWNER = {
     "kpcrispy3":    "Peterson",
@@ -112,9 +148,9 @@ def load_config(config_path: Path, args: argparse.Namespace) -> Dict:
         elif config_path.suffix == '.json':
             with open(config_path) as f:
                 cfg = json.load(f)
-        log.info(f"Loaded config from {config_path}")
+        log.info("Loaded config from %s", config_path)
     else:
-        log.warning(f"Config file not found: {config_path}. Using CLI args / env vars only.")
+        log.warning("Config file not found: %s. Using CLI args / env vars only.", config_path)
 
     return {
         "jsessionid": args.jsessionid or cfg.get("jsessionid") or os.getenv("FANTRAX_JSESSIONID", ""),
@@ -134,16 +170,23 @@ class FantraxAPI:
     def __init__(self, config: Dict):
         self.config = config
         self.session = requests.Session()
+        self.session.mount(FANTRAX_ORIGIN, HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=RETRY_POLICY))
+        self.limiter = RateLimiter(config.get("request_delay", 0.5))
         self.request_count = 0
+        self._league_headers: Dict[str, Dict[str, str]] = {}
+        self._public_cache: Dict[Tuple[str, str], Dict] = {}  # (endpoint, league_id) -> response
+        self._auth_failed = False
+        self._request_cookies = self._cookies()
 
     def _headers(self, league_id: str) -> Dict[str, str]:
-        return {
-            "accept": "application/json, text/plain, */*",
-            "content-type": "text/plain",
-            "origin": "https://www.fantrax.com",
-            "referer": f"https://www.fantrax.com/fantasy/league/{league_id}/team/roster",
-            "user-agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        }
+        # Built once per league; only content-type and referer are added
+        headers = self._league_headers.get(league_id)
+        if headers is None:
+            headers = self._league_headers[league_id] = INTERNAL_HEADERS | {
+                "content-type": "text/plain",
+                "referer": f"{FANTRAX_ORIGIN}/fantasy/league/{league_id}/team/roster",
+            }
+        return headers
 
     def _cookies(self) -> Dict[str, str]:
         cookies = {}
@@ -153,60 +196,65 @@ class FantraxAPI:
             cookies["FX_RM"] = self.config["fx_rm"]
         return cookies
 
-    def _sleep(self):
-        delay = self.config.get("request_delay", 0.5)
-        if delay > 0:
-            time.sleep(delay)
-
     def public_request(self, endpoint: str, params: Dict) -> Dict:
         """GET request to public /fxea API."""
         url = f"{BASE_URL}/{endpoint}"
         self.request_count += 1
-        log.debug(f"Request #{self.request_count}: GET {endpoint} params={params}")
+        log.debug("Request #%s: GET %s params=%s", self.request_count, endpoint, params)
 
+        self.limiter.wait()
         resp = self.session.get(url, params=params, timeout=30)
         resp.raise_for_status()
-        self._sleep()
-        return resp.json()
+        return parse_json(resp.content)
+
+    def public_request_once(self, endpoint: str, league_id: str, **params) -> Dict:
+        """public_request, memoized per (endpoint, league) for the life of the client.
+
+        Failures are not cached, so a later call retries.
+        """
+        key = (endpoint, league_id)
+        data = self._public_cache.get(key)
+        if data is None:
+            data = self._public_cache[key] = self.public_request(endpoint, {"leagueId": league_id, **params})
+        return data
 
     def internal_request(self, league_id: str, msgs: List[Dict]) -> Dict:
         """POST request to internal /fxpa API."""
+        if self._auth_failed:
+            raise RuntimeError("Session expired earlier in this run; skipping internal request.")
+
         url = f"{INTERNAL_API_URL}?leagueId={league_id}"
-        payload = {
-            "uiv": 3,
-            "refUrl": f"https://www.fantrax.com/fantasy/league/{league_id}/home",
-            "dt": 2,
-            "at": 0,
-            "av": "0.0",
-            "tz": "America/New_York",
-            "v": "182.0.1",
+        payload = PAYLOAD_TEMPLATE | {
+            "refUrl": f"{FANTRAX_ORIGIN}/fantasy/league/{league_id}/home",
             "msgs": msgs,
         }
 
         self.request_count += 1
         method = msgs[0].get("method", "unknown") if msgs else "unknown"
-        log.debug(f"Request #{self.request_count}: POST {method}")
+        log.debug("Request #%s: POST %s", self.request_count, method)
 
+        self.limiter.wait()
         resp = self.session.post(
             url,
             headers=self._headers(league_id),
-            cookies=self._cookies(),
+            cookies=self._request_cookies,
             json=payload,
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        body = resp.content
+        data = parse_json(body)
 
-        # Check for auth errors
-        self._check_auth(data, method)
-        self._sleep()
+        # Check for auth errors; the tree walk only runs if the code appears at all
+        if AUTH_ERROR_BYTES in body:
+            self._check_auth(data, method)
         return data
 
     def _check_auth(self, data: Dict, context: str):
         """Check for NOT_LOGGED_IN error."""
         def has_auth_error(obj):
             if isinstance(obj, dict):
-                if obj.get("pageError", {}).get("code") == "WARNING_NOT_LOGGED_IN":
+                if obj.get("pageError", {}).get("code") == AUTH_ERROR_CODE:
                     return True
                 return any(has_auth_error(v) for v in obj.values())
             elif isinstance(obj, list):
@@ -214,6 +262,7 @@ class FantraxAPI:
             return False
 
         if has_auth_error(data):
+            self._auth_failed = True
             raise RuntimeError(
                 f"Session expired (context: {context}). "
                 "Get a fresh JSESSIONID from Chrome DevTools -> Application -> Cookies -> fantrax.com"
@@ -225,20 +274,20 @@ class FantraxAPI:
         """Fetch rosters via public API."""
         try:
             data = self.public_request("getTeamRosters", {"leagueId": league_id})
-            log.info(f"Public roster API returned data for league {league_id}")
+            log.info("Public roster API returned data for league %s", league_id)
             return data
         except Exception as e:
-            log.warning(f"Public roster API failed: {e}")
+            log.warning("Public roster API failed: %s", e)
             return {}
 
     def get_league_info(self, league_id: str) -> Dict:
         """Fetch league info."""
         try:
-            data = self.public_request("getLeagueInfo", {"leagueId": league_id})
-            log.info(f"League info: {data.get('leagueName', 'unknown')}")
+            data = self.public_request_once("getLeagueInfo", league_id)
+            log.info("League info: %s", data.get("leagueName", "unknown"))
             return data
         except Exception as e:
-            log.warning(f"League info API failed: {e}")
+            log.warning("League info API failed: %s", e)
             return {}
 
     def get_fantasy_teams(self, league_id: str) -> List[Dict]:
@@ -256,20 +305,22 @@ class FantraxAPI:
     def get_player_ids(self, league_id: str) -> Dict:
         """Fetch player ID → name/position/team mapping (public, no auth)."""
         try:
+            # Fetched once per league per run; not memoized, so the multi-MB
+            # table is freed once the caller is done with it
             data = self.public_request("getPlayerIds", {"leagueId": league_id, "sport": "NBA"})
-            log.info(f"Player IDs: {len(data)} entries")
+            log.info("Player IDs: %s entries", len(data))
             return data
         except Exception as e:
-            log.warning(f"Player IDs API failed: {e}")
+            log.warning("Player IDs API failed: %s", e)
             return {}
 
     def get_league_team_info(self, league_id: str) -> Dict:
-        """Fetch league info including teamInfo mapping."""
+        """Fetch league info including teamInfo mapping (shares get_league_info's request)."""
         try:
-            data = self.public_request("getLeagueInfo", {"leagueId": league_id})
+            data = self.public_request_once("getLeagueInfo", league_id)
             return data.get("teamInfo", {})
         except Exception as e:
-            log.warning(f"League team info API failed: {e}")
+            log.warning("League team info API failed: %s", e)
             return {}
 
     def get_standings(self, league_id: str) -> Dict:
@@ -308,7 +359,7 @@ def parse_rosters_with_players(roster_data: Dict, player_ids: Dict, team_info: D
         # Map team name → owner
         owner_key = match_team_to_owner(team_name)
         if not owner_key:
-            log.warning(f"Could not match team '{team_name}' (id={team_id}) to any owner")
+            log.warning("Could not match team '%s' (id=%s) to any owner", team_name, team_id)
             owner_key = team_name
         display_name = OWNER_DISPLAY.get(owner_key, owner_key)
 
@@ -323,11 +374,8 @@ def parse_rosters_with_players(roster_data: Dict, player_ids: Dict, team_info: D
             raw_name = player_info.get("name", pid)
 
             # Names come as "Last, First" — convert to "First Last"
-            if ", " in raw_name:
-                parts = raw_name.split(", ", 1)
-                player_name = f"{parts[1]} {parts[0]}"
-            else:
-                player_name = raw_name
+            last, sep, first = raw_name.partition(", ")
+            player_name = f"{first} {last}" if sep else raw_name
 
             nba_team = player_info.get("team", "")
             if nba_team == "(N/A)":
@@ -376,13 +424,23 @@ TEAM_NAME_TO_OWNER = {
 }
 
 
+# Lowercased once at import for match_team_to_owner
+_TEAM_NAMES_LOWER = tuple((name.lower(), owner) for name, owner in TEAM_NAME_TO_OWNER.items())
+# reversed() so the first entry wins when two names differ only by case
+_TEAM_NAME_LOWER_TO_OWNER = {name: owner for name, owner in reversed(_TEAM_NAMES_LOWER)}
+
+
 def match_team_to_owner(team_name: str) -> Optional[str]:
     """Match a team name to an owner key."""
     if team_name in TEAM_NAME_TO_OWNER:
         return TEAM_NAME_TO_OWNER[team_name]
+    team_lower = team_name.lower()
+    owner = _TEAM_NAME_LOWER_TO_OWNER.get(team_lower)
+    if owner:
+        return owner
     # Fuzzy match: check if team name contains a key
-    for name, owner in TEAM_NAME_TO_OWNER.items():
-        if name.lower() in team_name.lower() or team_name.lower() in name.lower():
+    for name, owner in _TEAM_NAMES_LOWER:
+        if name in team_lower or team_lower in name:
             return owner
     return None
 
@@ -393,7 +451,7 @@ def match_team_to_owner(team_name: str) -> Optional[str]:
 
 def fetch_season(api: FantraxAPI, season: str, league_id: str) -> Dict:
     """Fetch roster data for a single season."""
-    log.info(f"=== Fetching {season} (league_id={league_id}) ===")
+    log.info("=== Fetching %s (league_id=%s) ===", season, league_id)
 
     # Step 1: Get rosters (public, no auth needed)
     roster_data = api.get_team_rosters_public(league_id)
@@ -408,7 +466,7 @@ def fetch_season(api: FantraxAPI, season: str, league_id: str) -> Dict:
         parsed = parse_rosters_with_players(roster_data, player_ids, team_info)
         if parsed:
             total_players = sum(len(t["players"]) for t in parsed.values())
-            log.info(f"Got {len(parsed)} teams, {total_players} players via public API")
+            log.info("Got %s teams, %s players via public API", len(parsed), total_players)
             return {"season": season, "league_id": league_id, "teams": parsed, "source": "public_api"}
 
     # Fallback to internal API (teams only, no player rosters)
@@ -431,15 +489,15 @@ def fetch_season(api: FantraxAPI, season: str, league_id: str) -> Dict:
                     "players": [],
                 }
 
-            log.info(f"Got {len(parsed)} teams via internal API (no player rosters)")
+            log.info("Got %s teams via internal API (no player rosters)", len(parsed))
             return {"season": season, "league_id": league_id, "teams": parsed, "source": "internal_api"}
 
     except RuntimeError as e:
-        log.error(f"Auth failed: {e}")
+        log.error("Auth failed: %s", e)
     except Exception as e:
-        log.error(f"Internal API failed: {e}")
+        log.error("Internal API failed: %s", e)
 
-    log.warning(f"Could not fetch data for {season}")
+    log.warning("Could not fetch data for %s", season)
     return {"season": season, "league_id": league_id, "teams": {}, "source": "failed"}
 
 
@@ -451,6 +509,7 @@ def main():
     parser.add_argument("--fx-rm", default="", dest="fx_rm", help="FX_RM cookie")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
     parser.add_argument("--config", default=str(SCRIPT_DIR / "config.yaml"), help="Config file path")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
     args = parser.parse_args()
 
     setup_logging(args.verbose)
@@ -474,7 +533,7 @@ def main():
         season = args.season
         league_id = LEAGUE_IDS.get(season, config["current_league_id"])
         if not league_id:
-            log.error(f"No league ID found for season {season}")
+            log.error("No league ID found for season %s", season)
             sys.exit(1)
         seasons_to_fetch = [(season, league_id)]
 
@@ -486,16 +545,15 @@ def main():
 
         # Write individual season file
         out_path = DOCS_DATA / f"rosters_{season.replace('-', '_')}.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2)
-        log.info(f"Wrote {out_path}")
+        save_json(out_path, result, pretty=args.pretty)
+        log.info("Wrote %s", out_path)
 
     # Summary
     log.info("\n=== SUMMARY ===")
     for season, result in all_results.items():
         teams = result.get("teams", {})
         total_players = sum(len(t.get("players", [])) for t in teams.values())
-        log.info(f"  {season}: {len(teams)} teams, {total_players} players (source: {result.get('source', '?')})")
+        log.info("  %s: %s teams, %s players (source: %s)", season, len(teams), total_players, result.get("source", "?"))
 
     log.info("Done!")
 
@@ -12,15 +12,21 @@ This script:
 
 Usage:
     python3 scripts/fetch_fantrax_scoring.py
+    python3 scripts/fetch_fantrax_scoring.py --pretty   # indented JSON for reviewing diffs
 """
 
-import json
+import argparse
 import re
 import sys
-import time
 import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from urllib.request import Request, urlopen
+
+from _bbref import fetch_per_game, parse_cached
+from _json_cache import read_json, save_json
+from _throttle import RateLimiter
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA = ROOT / "docs" / "data"
@@ -36,6 +42,31 @@ SEASONS_TO_FETCH = {
     2026: "2025-26",
 }
 
+# Seasons download concurrently, but request starts stay >= 2s apart
+FETCH_WORKERS = 3
+REQUEST_INTERVAL = 2.0
+
+# (fantrax_scoring.json field, parsed stat) pairs, in output order
+OUTPUT_FIELDS = (
+    ("total_fpts", "total_fpts"),
+    ("fpts_per_game", "fpts_pg"),
+    ("gp", "gp"),
+    ("ppg", "ppg"),
+    ("rpg", "rpg"),
+    ("apg", "apg"),
+    ("spg", "spg"),
+    ("bpg", "bpg"),
+    ("topg", "topg"),
+    ("fgm_pg", "fgm_pg"),
+    ("fga_pg", "fga_pg"),
+    ("ftm_pg", "ftm_pg"),
+    ("fta_pg", "fta_pg"),
+    ("fg3m_pg", "fg3m_pg"),
+)
+
+# Fields fetch_fantrax_scoring.py owns in player_stats_historical.json
+HISTORICAL_FIELDS = ("fgm_pg", "fga_pg", "ftm_pg", "fta_pg", "fg3m_pg", "fpts_pg", "total_fpts")
+
 NAME_OVERRIDES = {
     "DAngelo Russell": "D'Angelo Russell",
     "Nic Claxton": "Nicolas Claxton",
@@ -64,27 +95,41 @@ NAME_OVERRIDES = {
     "Brandom Ingram": "Brandon Ingram",
 }
 
+# basketball-reference per-game table, compiled once for the row loop
+_TBODY_RE = re.compile(r'id="per_game_stats".*?<tbody>(.*?)</tbody>', re.DOTALL)
+# Repeated header rows (<tr class="thead">) inside tbody are never matched
+_ROW_RE = re.compile(r'<tr(?![^>]*class="(?:thead|over_header)")[^>]*>(.*?)</tr>', re.DOTALL)
+_CELL_RE = re.compile(r'data-stat="([^"]*)"[^>]*>(.*?)</t[dh]>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+# Apostrophes (straight and curly) and periods are dropped for matching
+_PUNCT_MAP = str.maketrans("", "", "\u2019\u2018.'")
+# Trailing name suffixes, innermost first: "x sr jr" -> "x", "x jr sr" -> "x jr"
+_SUFFIX_RE = re.compile(r"(?: sr)?(?: iv)?(?: ii)?(?: iii)?(?: jr)?$")
 
-def normalize(name):
-    nfkd = unicodedata.normalize("NFD", name)
-    clean = "".join(c for c in nfkd if unicodedata.category(c) != "Mn").lower().strip()
-    clean = clean.replace("\u2019", "'").replace("\u2018", "'")
-    clean = clean.replace(".", "").replace("'", "")
-    for suffix in [" jr", " iii", " ii", " iv", " sr"]:
-        if clean.endswith(suffix):
-            clean = clean[: -len(suffix)]
-    return clean.strip()
 
+def _strip_marks(text):
+    nfkd = unicodedata.normalize("NFD", text)
+    return "".join(c for c in nfkd if unicodedata.category(c) != "Mn")
 
-def fetch_bbref(year):
-    url = f"https://www.basketball-reference.com/leagues/NBA_{year}_per_game.html"
-    req = Request(url, headers={
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/120.0.0.0 Safari/537.36",
-    })
-    with urlopen(req, timeout=30) as resp:
-        return resp.read().decode("utf-8")
+
+# Precomposed Latin letters (U+00C0-U+017F) -> unaccented base letters
+_ACCENT_MAP = str.maketrans({
+    c: _strip_marks(c)
+    for c in map(chr, range(0xC0, 0x180))
+    if _strip_marks(c) != c
+})
+
+
+@lru_cache(maxsize=4096)
+def normalize(name):
+    clean = name.translate(_ACCENT_MAP)
+    if not clean.isascii():
+        # Characters outside the table (or pre-decomposed input)
+        clean = _strip_marks(name)
+    clean = clean.lower().strip()
+    clean = clean.translate(_PUNCT_MAP)
+    clean = _SUFFIX_RE.sub("", clean)
+    return clean.strip()
 
 
 def compute_fpts(stats):
@@ -102,41 +147,45 @@ def compute_fpts(stats):
     tpm = stats.get("fg3m_pg", 0)
 
     return round(
-        pts * 1 + reb * 1 + ast * 2 + stl * 4 + blk * 4
-        + fgm * 2 - fga * 1 + ftm * 1 - fta * 1 + tpm * 1 - to * 2,
+        pts + reb + ast * 2 + stl * 4 + blk * 4
+        + fgm * 2 - fga + ftm - fta + tpm - to * 2,
         1
     )
 
 
+def _sf(row, key, default=0.0):
+    """A numeric cell as float, or default when blank/missing."""
+    value = row.get(key)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
 def parse_full_stats(html):
     """Parse per-game stats table with full stat lines (including FGM/FGA/FTM/FTA/3PM)."""
     players = {}
-    match = re.search(
-        r'id="per_game_stats".*?<tbody>(.*?)</tbody>',
-        html, re.DOTALL
-    )
+    match = _TBODY_RE.search(html)
     if not match:
         print("  ERROR: Could not find per_game_stats tbody")
         return players
 
     tbody = match.group(1)
-    rows = re.findall(r'<tr[^>]*>(.*?)</tr>', tbody, re.DOTALL)
+    rows = _ROW_RE.findall(tbody)
 
     for row_html in rows:
-        if 'class="thead"' in row_html or 'class="over_header"' in row_html:
-            continue
-
-        cells = re.findall(
-            r'data-stat="([^"]*)"[^>]*>(.*?)</t[dh]>',
-            row_html, re.DOTALL
-        )
+        cells = _CELL_RE.findall(row_html)
         if not cells:
             continue
 
         row_data = {}
         for stat, value in cells:
-            clean_val = re.sub(r'<[^>]+>', '', value).strip()
-            row_data[stat] = clean_val
+            # Most cells are bare numbers; only linked cells carry markup
+            if "<" in value:
+                value = _TAG_RE.sub('', value)
+            row_data[stat] = value.strip()
 
         player_name = row_data.get("name_display", "")
         if not player_name:
@@ -149,12 +198,6 @@ def parse_full_stats(html):
         if gp == 0:
             continue
 
-        def sf(key, default=0.0):
-            try:
-                return round(float(row_data.get(key, str(default))), 1)
-            except (ValueError, TypeError):
-                return default
-
         norm = normalize(player_name)
 
         # Keep entry with most games (TOT row for traded players)
@@ -166,100 +209,101 @@ def parse_full_stats(html):
             "team": row_data.get("team_name_abbr", ""),
             "pos": row_data.get("pos", ""),
             "gp": gp,
-            "mpg": sf("mp_per_g"),
-            "ppg": sf("pts_per_g"),
-            "rpg": sf("trb_per_g"),
-            "apg": sf("ast_per_g"),
-            "spg": sf("stl_per_g"),
-            "bpg": sf("blk_per_g"),
-            "topg": sf("tov_per_g"),
-            "fgm_pg": sf("fg_per_g"),
-            "fga_pg": sf("fga_per_g"),
-            "ftm_pg": sf("ft_per_g"),
-            "fta_pg": sf("fta_per_g"),
-            "fg3m_pg": sf("fg3_per_g"),
+            "mpg": _sf(row_data, "mp_per_g"),
+            "ppg": _sf(row_data, "pts_per_g"),
+            "rpg": _sf(row_data, "trb_per_g"),
+            "apg": _sf(row_data, "ast_per_g"),
+            "spg": _sf(row_data, "stl_per_g"),
+            "bpg": _sf(row_data, "blk_per_g"),
+            "topg": _sf(row_data, "tov_per_g"),
+            "fgm_pg": _sf(row_data, "fg_per_g"),
+            "fga_pg": _sf(row_data, "fga_per_g"),
+            "ftm_pg": _sf(row_data, "ft_per_g"),
+            "fta_pg": _sf(row_data, "fta_per_g"),
+            "fg3m_pg": _sf(row_data, "fg3_per_g"),
         }
 
-        stats["fpts_pg"] = compute_fpts(stats)
-        stats["total_fpts"] = round(stats["fpts_pg"] * gp, 0)
         players[norm] = stats
 
+    # Score once per kept row, after TOT rows have replaced per-team ones
+    for stats in players.values():
+        stats["fpts_pg"] = compute_fpts(stats)
+        stats["total_fpts"] = round(stats["fpts_pg"] * stats["gp"], 0)
+
     return players
 
 
+def fetch_season(year, limiter):
+    """Download and parse one season's per-game page (runs in a worker)."""
+    limiter.wait()
+    return parse_cached(fetch_per_game(year), parse_full_stats, f"scoring_{year}")
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Compute Fantrax FPts from basketball-reference per-game stats")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    args = parser.parse_args()
+
     print("=== Fetch Fantrax Scoring ===\n")
     print("Fantrax formula: PTS + REB + AST*2 + STL*4 + BLK*4 + FGM*2 - FGA + FTM - FTA + 3PM - TO*2\n")
 
     all_seasons = {}
 
-    # Check if we already have cached HTML or need to re-fetch
-    for year, season_label in sorted(SEASONS_TO_FETCH.items()):
-        print(f"Fetching {season_label} (bbref year {year})...")
-        try:
-            html = fetch_bbref(year)
-            players = parse_full_stats(html)
-            all_seasons[season_label] = players
-            print(f"  Parsed {len(players)} players")
-
-            # Show top 5 by FPts/g
-            top = sorted(players.values(), key=lambda p: p["fpts_pg"], reverse=True)[:5]
-            for p in top:
-                print(f"    {p['player_name']}: {p['fpts_pg']} FPts/g ({p['total_fpts']:.0f} total, {p['gp']} GP)")
-
-            time.sleep(3)  # Rate limiting
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            all_seasons[season_label] = {}
+    limiter = RateLimiter(REQUEST_INTERVAL)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        pending = [
+            (year, season_label, ex.submit(fetch_season, year, limiter))
+            for year, season_label in sorted(SEASONS_TO_FETCH.items())
+        ]
+        # Report in season order, whichever download finishes first
+        for year, season_label, future in pending:
+            print(f"Fetching {season_label} (bbref year {year})...")
+            try:
+                players = future.result()
+                all_seasons[season_label] = players
+                print(f"  Parsed {len(players)} players")
+
+                # Show top 5 by FPts/g
+                top = sorted(players.values(), key=lambda p: p["fpts_pg"], reverse=True)[:5]
+                for p in top:
+                    print(f"    {p['player_name']}: {p['fpts_pg']} FPts/g ({p['total_fpts']:.0f} total, {p['gp']} GP)")
+            except Exception as e:
+                print(f"  ERROR: {e}")
+                all_seasons[season_label] = {}
 
     # Save output
-    output = {}
+    output = defaultdict(dict)
     for season, players in all_seasons.items():
-        for norm, stats in players.items():
-            name = stats["player_name"]
-            if name not in output:
-                output[name] = {}
-            output[name][season] = {
-                "total_fpts": stats["total_fpts"],
-                "fpts_per_game": stats["fpts_pg"],
-                "gp": stats["gp"],
-                "ppg": stats["ppg"],
-                "rpg": stats["rpg"],
-                "apg": stats["apg"],
-                "spg": stats["spg"],
-                "bpg": stats["bpg"],
-                "topg": stats["topg"],
-                "fgm_pg": stats["fgm_pg"],
-                "fga_pg": stats["fga_pg"],
-                "ftm_pg": stats["ftm_pg"],
-                "fta_pg": stats["fta_pg"],
-                "fg3m_pg": stats["fg3m_pg"],
+        for stats in players.values():
+            output[stats["player_name"]][season] = {
+                out: round(stats[key], 1) for out, key in OUTPUT_FIELDS
             }
+    output = dict(output)
 
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(output, f, indent=2)
+    save_json(OUTPUT_PATH, output, pretty=args.pretty)
 
     # Also update the historical stats file with FPts data
     if HISTORICAL_PATH.exists():
-        with open(HISTORICAL_PATH) as f:
-            hist = json.load(f)
+        hist = read_json(HISTORICAL_PATH)
         updated = 0
-        for season in hist:
-            if season not in all_seasons:
+        changed = False
+        for season, season_stats in hist.items():
+            fresh = all_seasons.get(season)
+            if not fresh:
                 continue
-            for norm, stats in hist[season].items():
-                if norm in all_seasons[season]:
-                    new_data = all_seasons[season][norm]
-                    stats["fgm_pg"] = new_data["fgm_pg"]
-                    stats["fga_pg"] = new_data["fga_pg"]
-                    stats["ftm_pg"] = new_data["ftm_pg"]
-                    stats["fta_pg"] = new_data["fta_pg"]
-                    stats["fg3m_pg"] = new_data["fg3m_pg"]
-                    stats["fpts_pg"] = new_data["fpts_pg"]
-                    stats["total_fpts"] = new_data["total_fpts"]
-                    updated += 1
-        with open(HISTORICAL_PATH, "w") as f:
-            json.dump(hist, f, indent=2)
+            for norm, stats in season_stats.items():
+                new_data = fresh.get(norm)
+                if new_data is None:
+                    continue
+                for key in HISTORICAL_FIELDS:
+                    value = round(new_data[key], 1)
+                    if stats.get(key) != value:
+                        stats[key] = value
+                        changed = True
+                updated += 1
+        # Closed seasons rarely move; skip rewriting 1.5 MB when nothing did
+        if changed:
+            save_json(HISTORICAL_PATH, hist, pretty=args.pretty)
         print(f"\nUpdated {updated} player-season entries in historical stats")
 
     total_players = len(output)
@@ -7,15 +7,19 @@ our roster data. Uses a single page load instead of per-player API calls.
 
 Usage:
     python3 scripts/fetch_player_stats.py
+    python3 scripts/fetch_player_stats.py --pretty   # indented JSON for reviewing diffs
 """
 
-import json
+import argparse
 import re
 import sys
 import unicodedata
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from urllib.request import Request, urlopen
+
+from _bbref import fetch_per_game
+from _json_cache import read_json, save_json
 
 ROOT = Path(__file__).resolve().parent.parent
 ROSTER_PATH = ROOT / "docs" / "data" / "rosters_2025_26.json"
@@ -24,6 +28,9 @@ OUTPUT_PATH = ROOT / "docs" / "data" / "player_stats.json"
 SEASON_YEAR = 2025  # basketball-reference uses end year (2024-25 → 2025)
 SEASON_LABEL = "2024-25"
 
+# Per-game fields copied from the parsed bbref row, in output order
+STAT_FIELDS = ("mpg", "ppg", "rpg", "apg", "spg", "bpg", "topg", "fg_pct", "fg3_pct", "ft_pct")
+
 # Manual name mappings for roster names → basketball-reference names
 NAME_OVERRIDES = {
     "DAngelo Russell": "D'Angelo Russell",
@@ -54,33 +61,55 @@ NAME_OVERRIDES = {
     "Robert Dillingham": "Rob Dillingham",
 }
 
+# basketball-reference per-game table, compiled once for the row loop
+_TBODY_RE = re.compile(r'id="per_game_stats".*?<tbody>(.*?)</tbody>', re.DOTALL)
+# Repeated header rows (<tr class="thead">) inside tbody are never matched
+_ROW_RE = re.compile(r'<tr(?![^>]*class="(?:thead|over_header)")[^>]*>(.*?)</tr>', re.DOTALL)
+_CELL_RE = re.compile(r'data-stat="([^"]*)"[^>]*>(.*?)</t[dh]>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+# Curly apostrophes -> straight; periods dropped
+_PUNCT_MAP = str.maketrans({"\u2019": "'", "\u2018": "'", ".": None})
+# Trailing name suffixes, innermost first: "x sr jr" -> "x", "x jr sr" -> "x jr"
+_SUFFIX_RE = re.compile(r"(?: sr)?(?: iv)?(?: ii)?(?: iii)?(?: jr)?$")
+
+
+def _strip_marks(text):
+    nfkd = unicodedata.normalize("NFD", text)
+    return "".join(c for c in nfkd if unicodedata.category(c) != "Mn")
+
+
+# Precomposed Latin letters (U+00C0-U+017F) -> unaccented base letters
+_ACCENT_MAP = str.maketrans({
+    c: _strip_marks(c)
+    for c in map(chr, range(0xC0, 0x180))
+    if _strip_marks(c) != c
+})
 
+
+@lru_cache(maxsize=4096)
 def normalize(name):
     """Strip accents, lowercase, remove suffixes for matching."""
-    nfkd = unicodedata.normalize("NFD", name)
-    clean = "".join(c for c in nfkd if unicodedata.category(c) != "Mn").lower().strip()
-    # Normalize apostrophes
-    clean = clean.replace("\u2019", "'").replace("\u2018", "'")
-    # Remove periods from initials
-    clean = clean.replace(".", "")
+    clean = name.translate(_ACCENT_MAP)
+    if not clean.isascii():
+        # Characters outside the table (or pre-decomposed input)
+        clean = _strip_marks(name)
+    clean = clean.lower().strip()
+    # Normalize apostrophes, remove periods from initials
+    clean = clean.translate(_PUNCT_MAP)
     # Remove common suffixes for matching
-    for suffix in [" jr", " iii", " ii", " iv", " sr"]:
-        if clean.endswith(suffix):
-            clean = clean[: -len(suffix)]
+    clean = _SUFFIX_RE.sub("", clean)
     return clean.strip()
 
 
-def fetch_bbref_stats(year):
-    """Fetch per-game stats from basketball-reference.com."""
-    url = f"https://www.basketball-reference.com/leagues/NBA_{year}_per_game.html"
-    req = Request(url, headers={
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/120.0.0.0 Safari/537.36",
-    })
-    with urlopen(req, timeout=30) as resp:
-        html = resp.read().decode("utf-8")
-    return html
+def _sf(row, key, default=0.0):
+    """A numeric cell as float, or default when blank/missing."""
+    value = row.get(key)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
 
 
 def parse_stats_table(html):
@@ -88,34 +117,26 @@ def parse_stats_table(html):
     players = {}
 
     # Find the per_game_stats table body
-    match = re.search(
-        r'id="per_game_stats".*?<tbody>(.*?)</tbody>',
-        html, re.DOTALL
-    )
+    match = _TBODY_RE.search(html)
     if not match:
         print("ERROR: Could not find per_game_stats tbody")
         return players
 
     tbody = match.group(1)
-    rows = re.findall(r'<tr[^>]*>(.*?)</tr>', tbody, re.DOTALL)
+    rows = _ROW_RE.findall(tbody)
 
     for row_html in rows:
-        # Skip separator/header rows
-        if 'class="thead"' in row_html or 'class="over_header"' in row_html:
-            continue
-
         # Extract data-stat → value pairs
-        cells = re.findall(
-            r'data-stat="([^"]*)"[^>]*>(.*?)</t[dh]>',
-            row_html, re.DOTALL
-        )
+        cells = _CELL_RE.findall(row_html)
         if not cells:
             continue
 
         row_data = {}
         for stat, value in cells:
-            clean_val = re.sub(r'<[^>]+>', '', value).strip()
-            row_data[stat] = clean_val
+            # Most cells are bare numbers; only linked cells carry markup
+            if "<" in value:
+                value = _TAG_RE.sub('', value)
+            row_data[stat] = value.strip()
 
         player_name = row_data.get("name_display", "")
         if not player_name:
@@ -132,12 +153,6 @@ def parse_stats_table(html):
         if gp_int == 0:
             continue
 
-        def safe_float(key, default=0.0):
-            try:
-                return float(row_data.get(key, str(default)))
-            except (ValueError, TypeError):
-                return default
-
         norm = normalize(player_name)
 
         # Keep entry with most games (handles TOT rows for traded players)
@@ -146,22 +161,22 @@ def parse_stats_table(html):
                 continue
 
         # bbref percentages are decimal (e.g. .519)
-        fg_pct = safe_float("fg_pct")
-        fg3_pct = safe_float("fg3_pct")
-        ft_pct = safe_float("ft_pct")
+        fg_pct = _sf(row_data, "fg_pct")
+        fg3_pct = _sf(row_data, "fg3_pct")
+        ft_pct = _sf(row_data, "ft_pct")
 
         players[norm] = {
             "player_name": player_name,
             "team": team,
             "pos": pos,
             "gp": gp_int,
-            "mpg": safe_float("mp_per_g"),
-            "ppg": safe_float("pts_per_g"),
-            "rpg": safe_float("trb_per_g"),
-            "apg": safe_float("ast_per_g"),
-            "spg": safe_float("stl_per_g"),
-            "bpg": safe_float("blk_per_g"),
-            "topg": safe_float("tov_per_g"),
+            "mpg": _sf(row_data, "mp_per_g"),
+            "ppg": _sf(row_data, "pts_per_g"),
+            "rpg": _sf(row_data, "trb_per_g"),
+            "apg": _sf(row_data, "ast_per_g"),
+            "spg": _sf(row_data, "stl_per_g"),
+            "bpg": _sf(row_data, "blk_per_g"),
+            "topg": _sf(row_data, "tov_per_g"),
             "fg_pct": fg_pct * 100 if fg_pct < 1 else fg_pct,
             "fg3_pct": fg3_pct * 100 if fg3_pct < 1 else fg3_pct,
             "ft_pct": ft_pct * 100 if ft_pct < 1 else ft_pct,
@@ -170,13 +185,28 @@ def parse_stats_table(html):
     return players
 
 
+def player_entry(row, meta, season):
+    """Build a player_stats.json entry; stats are rounded here, once."""
+    stats = {"gp": row["gp"]}
+    stats.update((key, round(row[key], 1)) for key in STAT_FIELDS)
+    stats["season"] = season
+    return {
+        "nba_team": row["team"] or meta["nba_team"],
+        "pos": meta["pos"] or row["pos"],
+        "stats": stats,
+    }
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Pull basketball-reference stats for rostered players")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    args = parser.parse_args()
+
     if not ROSTER_PATH.exists():
         print(f"Error: {ROSTER_PATH} not found")
         sys.exit(1)
 
-    with open(ROSTER_PATH) as f:
-        roster_data = json.load(f)
+    roster_data = read_json(ROSTER_PATH)
 
     teams = roster_data.get("teams", {})
 
@@ -196,53 +226,33 @@ def main():
     # Fetch stats from basketball-reference
     print(f"Fetching {SEASON_LABEL} stats from basketball-reference.com...")
     try:
-        html = fetch_bbref_stats(SEASON_YEAR)
+        html = fetch_per_game(SEASON_YEAR)
         bbref_stats = parse_stats_table(html)
         print(f"  Parsed {len(bbref_stats)} player stat lines")
     except Exception as e:
         print(f"Error fetching stats: {e}")
         sys.exit(1)
 
+    # Lookup keys per roster player: override name first, then the original
+    roster_keys = {
+        name: (normalize(NAME_OVERRIDES.get(name, name)), normalize(name))
+        for name in sorted(player_meta)
+    }
+
     # Match roster players to bbref stats
     result = {}
     missed = []
 
-    for count, name in enumerate(sorted(player_meta.keys()), 1):
+    for count, (name, (key, fallback_key)) in enumerate(roster_keys.items(), 1):
         meta = player_meta[name]
-
-        # Try override name first
-        override = NAME_OVERRIDES.get(name, name)
-        norm = normalize(override)
-
-        row = bbref_stats.get(norm)
-
-        # If not found and override differs, try original
-        if row is None and override != name:
-            row = bbref_stats.get(normalize(name))
+        row = bbref_stats.get(key) or bbref_stats.get(fallback_key)
 
         if row is None:
             missed.append(name)
             print(f"  [{count}/{len(player_meta)}] MISS: {name}")
             continue
 
-        result[name] = {
-            "nba_team": row["team"] or meta["nba_team"],
-            "pos": meta["pos"] or row["pos"],
-            "stats": {
-                "gp": row["gp"],
-                "mpg": round(row["mpg"], 1),
-                "ppg": round(row["ppg"], 1),
-                "rpg": round(row["rpg"], 1),
-                "apg": round(row["apg"], 1),
-                "spg": round(row["spg"], 1),
-                "bpg": round(row["bpg"], 1),
-                "topg": round(row["topg"], 1),
-                "fg_pct": round(row["fg_pct"], 1),
-                "fg3_pct": round(row["fg3_pct"], 1),
-                "ft_pct": round(row["ft_pct"], 1),
-                "season": SEASON_LABEL,
-            },
-        }
+        result[name] = player_entry(row, meta, SEASON_LABEL)
         ppg = result[name]["stats"]["ppg"]
         print(f"  [{count}/{len(player_meta)}] OK: {name} ({ppg} ppg)")
 
@@ -250,41 +260,21 @@ def main():
     if missed:
         print(f"\nRetrying {len(missed)} missed players with 2025-26 season...")
         try:
-            html2 = fetch_bbref_stats(2026)
+            html2 = fetch_per_game(2026)
             bbref_stats2 = parse_stats_table(html2)
             print(f"  Parsed {len(bbref_stats2)} player stat lines (2025-26)")
 
             still_missed = []
             for name in missed:
-                override = NAME_OVERRIDES.get(name, name)
-                norm = normalize(override)
-                row = bbref_stats2.get(norm)
-                if row is None and override != name:
-                    row = bbref_stats2.get(normalize(name))
+                key, fallback_key = roster_keys[name]
+                row = bbref_stats2.get(key) or bbref_stats2.get(fallback_key)
 
                 if row is None:
                     still_missed.append(name)
                     continue
 
                 meta = player_meta[name]
-                result[name] = {
-                    "nba_team": row["team"] or meta["nba_team"],
-                    "pos": meta["pos"] or row["pos"],
-                    "stats": {
-                        "gp": row["gp"],
-                        "mpg": round(row["mpg"], 1),
-                        "ppg": round(row["ppg"], 1),
-                        "rpg": round(row["rpg"], 1),
-                        "apg": round(row["apg"], 1),
-                        "spg": round(row["spg"], 1),
-                        "bpg": round(row["bpg"], 1),
-                        "topg": round(row["topg"], 1),
-                        "fg_pct": round(row["fg_pct"], 1),
-                        "fg3_pct": round(row["fg3_pct"], 1),
-                        "ft_pct": round(row["ft_pct"], 1),
-                        "season": "2025-26",
-                    },
-                }
+                result[name] = player_entry(row, meta, "2025-26")
                 ppg = result[name]["stats"]["ppg"]
                 print(f"  RETRY OK: {name} ({ppg} ppg, 2025-26)")
 
@@ -307,8 +297,7 @@ def main():
     }
 
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(output, f, indent=2)
+    save_json(OUTPUT_PATH, output, pretty=args.pretty)
 
     print(f"\nDone! {len(result)}/{len(player_meta)} players matched")
     print(f"Missed: {len(missed)} players")
@@ -20,15 +20,22 @@ Data sources:
 
 Usage:
     python3 scripts/grade_trades.py
+    python3 scripts/grade_trades.py --pretty   # indented JSON for reviewing diffs
 """
 
-import json
+import argparse
 import re
 import sys
-import time
 import unicodedata
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from urllib.request import Request, urlopen
+
+from _bbref import fetch_per_game
+from _json_cache import read_json, save_json
+from _throttle import RateLimiter
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA = ROOT / "docs" / "data"
@@ -43,6 +50,10 @@ SEASONS_TO_FETCH = {
     2026: "2025-26",
 }
 
+# Seasons download concurrently, but request starts stay >= 2s apart
+FETCH_WORKERS = 2
+REQUEST_INTERVAL = 2.0
+
 NAME_OVERRIDES = {
     "DAngelo Russell": "D'Angelo Russell",
     "Nic Claxton": "Nicolas Claxton",
@@ -81,17 +92,59 @@ GRADE_SCALE = [
     (float("-inf"), "F"),
 ]
 
+
+def _bisect_table(scale):
+    """Split a descending (threshold, grade) scale into ascending cuts + labels."""
+    ascending = scale[::-1]
+    return [t for t, _ in ascending[1:]], [g for _, g in ascending]
+
+
+_GRADE_CUTS, _GRADE_LABELS = _bisect_table(GRADE_SCALE)
+
 SEASON_ORDER = [
     "2020-21", "2021-22", "2022-23", "2023-24", "2024-25", "2025-26"
 ]
-
-
+_SEASON_NEXT = dict(zip(SEASON_ORDER, SEASON_ORDER[1:]))
+
+# basketball-reference per-game table, compiled once for the row loop
+_TBODY_RE = re.compile(r'id="per_game_stats".*?<tbody>(.*?)</tbody>', re.DOTALL)
+_ROW_RE = re.compile(r'<tr[^>]*>(.*?)</tr>', re.DOTALL)
+_CELL_RE = re.compile(r'data-stat="([^"]*)"[^>]*>(.*?)</t[dh]>', re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
+# The only data-stat cells parse_stats_table reads; the other ~20 are skipped
+_WANTED = frozenset({
+    "name_display", "team_name_abbr", "pos", "games", "mp_per_g",
+    "pts_per_g", "trb_per_g", "ast_per_g", "stl_per_g", "blk_per_g",
+    "tov_per_g", "fg_pct", "fg3_pct", "ft_pct",
+})
+
+# Trade item parsing
+_POS_RE = re.compile(r"^(?:PG|SG|SF|PF|C)(?:/(?:PG|SG|SF|PF|C))?$", re.I)
+_PICK_RE = re.compile(r"(?:1st|2nd)\s*(?:round|rd)|pick|swap", re.I)
+
+# Apostrophes (straight and curly) and periods are dropped for matching
+_PUNCT_MAP = str.maketrans("", "", "\u2019\u2018.'")
+
+# One parsed bbref row; field order is the key order of the JSON cache.
+# Defaults fill columns missing from older or foreign cache rows.
+PlayerStats = namedtuple(
+    "PlayerStats",
+    "player_name team pos gp mpg ppg rpg apg spg bpg topg fg_pct fg3_pct ft_pct",
+    defaults=("", "", "", 0) + (0.0,) * 10,
+)
+
+
+@lru_cache(maxsize=None)
 def normalize(name):
     """Strip accents, lowercase, remove suffixes for matching."""
-    nfkd = unicodedata.normalize("NFD", name)
-    clean = "".join(c for c in nfkd if unicodedata.category(c) != "Mn").lower().strip()
-    clean = clean.replace("\u2019", "'").replace("\u2018", "'")
-    clean = clean.replace(".", "").replace("'", "")
+    if name.isascii():
+        # Nothing to decompose or strip; most names take this path
+        clean = name.lower().strip()
+    else:
+        # Quick-check first: already-decomposed input needs no new string
+        nfkd = name if unicodedata.is_normalized("NFD", name) else unicodedata.normalize("NFD", name)
+        clean = "".join(c for c in nfkd if unicodedata.category(c) != "Mn").lower().strip()
+    clean = clean.translate(_PUNCT_MAP)
     for suffix in [" jr", " iii", " ii", " iv", " sr"]:
         if clean.endswith(suffix):
             clean = clean[: -len(suffix)]
@@ -100,62 +153,41 @@ def normalize(name):
 
 def delta_to_grade(delta):
     """Convert a production delta to a letter grade."""
-    for threshold, grade in GRADE_SCALE:
-        if delta >= threshold:
-            return grade
-    return "F"
+    return _GRADE_LABELS[bisect_right(_GRADE_CUTS, delta)]
 
 
 def next_season(season):
     """Return the season AFTER the given one, or None."""
-    idx = SEASON_ORDER.index(season) if season in SEASON_ORDER else -1
-    if idx >= 0 and idx < len(SEASON_ORDER) - 1:
-        return SEASON_ORDER[idx + 1]
-    return None
-
-
-def fetch_bbref_stats(year):
-    """Fetch per-game stats from basketball-reference.com for a given year."""
-    url = f"https://www.basketball-reference.com/leagues/NBA_{year}_per_game.html"
-    req = Request(url, headers={
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/120.0.0.0 Safari/537.36",
-    })
-    with urlopen(req, timeout=30) as resp:
-        html = resp.read().decode("utf-8")
-    return html
+    return _SEASON_NEXT.get(season)
 
 
 def parse_stats_table(html):
     """Parse the per-game stats table from basketball-reference HTML."""
     players = {}
-    match = re.search(
-        r'id="per_game_stats".*?<tbody>(.*?)</tbody>',
-        html, re.DOTALL
-    )
+    match = _TBODY_RE.search(html)
     if not match:
         print("  ERROR: Could not find per_game_stats tbody")
         return players
 
     tbody = match.group(1)
-    rows = re.findall(r'<tr[^>]*>(.*?)</tr>', tbody, re.DOTALL)
 
-    for row_html in rows:
+    for row_match in _ROW_RE.finditer(tbody):
+        row_html = row_match.group(1)
         if 'class="thead"' in row_html or 'class="over_header"' in row_html:
             continue
 
-        cells = re.findall(
-            r'data-stat="([^"]*)"[^>]*>(.*?)</t[dh]>',
-            row_html, re.DOTALL
-        )
+        cells = _CELL_RE.findall(row_html)
         if not cells:
             continue
 
         row_data = {}
         for stat, value in cells:
-            clean_val = re.sub(r'<[^>]+>', '', value).strip()
-            row_data[stat] = clean_val
+            if stat not in _WANTED:
+                continue
+            # Most cells are bare numbers; only linked cells carry markup
+            if "<" in value:
+                value = _TAG_RE.sub('', value)
+            row_data[stat] = value.strip()
 
         player_name = row_data.get("name_display", "")
         if not player_name:
@@ -177,63 +209,98 @@ def parse_stats_table(html):
         norm = normalize(player_name)
 
         # Keep entry with most games (TOT row for traded players)
-        if norm in players and gp <= players[norm]["gp"]:
+        if norm in players and gp <= players[norm].gp:
             continue
 
         fg_pct = sf("fg_pct")
         fg3_pct = sf("fg3_pct")
         ft_pct = sf("ft_pct")
 
-        players[norm] = {
-            "player_name": player_name,
-            "team": row_data.get("team_name_abbr", ""),
-            "pos": row_data.get("pos", ""),
-            "gp": gp,
-            "mpg": sf("mp_per_g"),
-            "ppg": sf("pts_per_g"),
-            "rpg": sf("trb_per_g"),
-            "apg": sf("ast_per_g"),
-            "spg": sf("stl_per_g"),
-            "bpg": sf("blk_per_g"),
-            "topg": sf("tov_per_g"),
-            "fg_pct": round(fg_pct * 100, 1) if fg_pct < 1 else fg_pct,
-            "fg3_pct": round(fg3_pct * 100, 1) if fg3_pct < 1 else fg3_pct,
-            "ft_pct": round(ft_pct * 100, 1) if ft_pct < 1 else ft_pct,
-        }
+        players[norm] = PlayerStats(
+            player_name=player_name,
+            team=row_data.get("team_name_abbr", ""),
+            pos=row_data.get("pos", ""),
+            gp=gp,
+            mpg=sf("mp_per_g"),
+            ppg=sf("pts_per_g"),
+            rpg=sf("trb_per_g"),
+            apg=sf("ast_per_g"),
+            spg=sf("stl_per_g"),
+            bpg=sf("blk_per_g"),
+            topg=sf("tov_per_g"),
+            fg_pct=round(fg_pct * 100, 1) if fg_pct < 1 else fg_pct,
+            fg3_pct=round(fg3_pct * 100, 1) if fg3_pct < 1 else fg3_pct,
+            ft_pct=round(ft_pct * 100, 1) if ft_pct < 1 else ft_pct,
+        )
 
     return players
 
 
-def build_historical_stats():
-    """Fetch and cache multi-season stats from basketball-reference."""
+def fetch_season(year, limiter):
+    """Download and parse one season's per-game page (runs in a worker).
+
+    The ~40 ms parse fits inside the REQUEST_INTERVAL gap between request
+    starts, so it adds nothing to the build.
+    """
+    limiter.wait()
+    return parse_stats_table(fetch_per_game(year))
+
+
+def _cached_row(row):
+    """PlayerStats from a JSON cache row, or None for an empty row.
+
+    The cache also carries fetch_fantrax_scoring.py's columns; only ours are
+    kept, and any missing ones take the PlayerStats defaults.
+    """
+    if not row:
+        return None
+    return PlayerStats(**{f: row[f] for f in PlayerStats._fields if f in row})
+
+
+def build_historical_stats(pretty=False):
+    """Fetch and cache multi-season stats from basketball-reference.
+
+    pretty indents the cache the same way fetch_fantrax_scoring.py --pretty
+    does, so the two writers of the file agree on its layout.
+    """
     cache_path = DATA / "player_stats_historical.json"
     if cache_path.exists():
         print("Loading cached historical stats...")
-        with open(cache_path) as f:
-            return json.load(f)
+        return {
+            season: {norm: _cached_row(row) for norm, row in players.items()}
+            for season, players in read_json(cache_path).items()
+        }
 
     print("Building historical stats from basketball-reference.com...")
     all_stats = {}
 
-    for year, label in sorted(SEASONS_TO_FETCH.items()):
-        print(f"  Fetching {label} (year={year})...")
-        try:
-            html = fetch_bbref_stats(year)
-            season_stats = parse_stats_table(html)
-            print(f"    → {len(season_stats)} players parsed")
-            all_stats[label] = season_stats
-            time.sleep(3)  # Respect rate limits
-        except Exception as e:
-            print(f"    ERROR: {e}")
-            all_stats[label] = {}
-
-    # Save cache
-    with open(cache_path, "w") as f:
-        json.dump(all_stats, f, indent=2)
+    limiter = RateLimiter(REQUEST_INTERVAL)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as ex:
+        pending = [
+            (year, label, ex.submit(fetch_season, year, limiter))
+            for year, label in sorted(SEASONS_TO_FETCH.items())
+        ]
+        # Report in season order, whichever download finishes first
+        for year, label, future in pending:
+            print(f"  Fetching {label} (year={year})...")
+            try:
+                season_stats = future.result()
+                print(f"    → {len(season_stats)} players parsed")
+                all_stats[label] = season_stats
+            except Exception as e:
+                print(f"    ERROR: {e}")
+                all_stats[label] = {}
+
+    # Save cache (shared with fetch_fantrax_scoring.py / compute_trade_windows.py)
+    save_json(cache_path, {
+        season: {norm: stats._asdict() for norm, stats in players.items()}
+        for season, players in all_stats.items()
+    }, pretty=pretty)
     print(f"  Saved to {cache_path}")
     return all_stats
 
 
+@lru_cache(maxsize=None)
 def parse_trade_item(item):
     """Parse a trade item like 'JOWK SF/PF Deandre Hunter' into (owner_abbr, asset_name)."""
     parts = item.strip().split()
@@ -242,17 +309,15 @@ def parse_trade_item(item):
     abbr = parts[0]
     rest = parts[1:]
     # Strip position prefix
-    if len(rest) > 1 and re.match(
-        r"^(?:PG|SG|SF|PF|C)(?:/(?:PG|SG|SF|PF|C))?$", rest[0], re.I
-    ):
+    if len(rest) > 1 and _POS_RE.match(rest[0]):
         rest = rest[1:]
     return (abbr, " ".join(rest))
 
 
+@lru_cache(maxsize=None)
 def is_pick(asset):
     """Check if a trade asset is a draft pick."""
-    lower = asset.lower()
-    return bool(re.search(r"(?:1st|2nd)\s*(?:round|rd)", lower)) or "pick" in lower or "swap" in lower
+    return _PICK_RE.search(asset) is not None
 
 
 # Owner abbreviation → canonical name
@@ -275,50 +340,57 @@ def resolve_owner(abbr):
     return OWNER_MAP.get(abbr.upper(), abbr)
 
 
-def get_player_stats_for_season(historical, player_name, season):
-    """Look up a player's stats for a given season."""
-    if season not in historical:
-        return None
-
-    # Try the trade name directly
-    norm = normalize(player_name)
-    season_data = historical[season]
-    if norm in season_data:
-        return season_data[norm]
+def get_player_stats_for_season(table, player_name, season):
+    """Look up a player's row for a season in a build_fpg_table() table.
 
-    # Try name overrides
-    override = NAME_OVERRIDES.get(player_name)
-    if override:
-        norm2 = normalize(override)
-        if norm2 in season_data:
-            return season_data[norm2]
-
-    return None
+    NAME_OVERRIDES are folded into the table as aliases, so one lookup
+    covers both spellings.
+    """
+    return table.get(season, {}).get(normalize(player_name))
 
 
 def compute_fantasy_points(stats):
     """Compute a simple fantasy points per game from stats."""
     if not stats:
         return 0.0
-    ppg = stats.get("ppg", 0)
-    rpg = stats.get("rpg", 0)
-    apg = stats.get("apg", 0)
-    spg = stats.get("spg", 0)
-    bpg = stats.get("bpg", 0)
-    topg = stats.get("topg", 0)
     # Standard fantasy scoring: PTS*1 + REB*1.2 + AST*1.5 + STL*3 + BLK*3 - TO*1
-    fpg = ppg + rpg * 1.2 + apg * 1.5 + spg * 3 + bpg * 3 - topg * 1.0
+    fpg = (stats.ppg + stats.rpg * 1.2 + stats.apg * 1.5
+           + stats.spg * 3 + stats.bpg * 3 - stats.topg)
     return round(fpg, 1)
 
 
+def build_fpg_table(historical):
+    """{season: {norm_name: (fpg, stats)}}, so each FPts/g is computed once.
+
+    Each NAME_OVERRIDES alias is added as a second key for its target's row,
+    unless the alias already has a row of its own.
+    """
+    override_keys = [(normalize(alias), normalize(target)) for alias, target in NAME_OVERRIDES.items()]
+    table = {}
+    for season, players in historical.items():
+        rows = {
+            norm: (compute_fantasy_points(stats) if stats else None, stats)
+            for norm, stats in players.items()
+        }
+        for alias_key, target_key in override_keys:
+            if alias_key not in rows and target_key in rows:
+                rows[alias_key] = rows[target_key]
+        table[season] = rows
+    return table
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Grade every trade on pre/post-trade production")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output for human review")
+    args = parser.parse_args()
+
     # Load all data
     print("=" * 60)
     print("TRADE GRADING PIPELINE")
     print("=" * 60)
 
-    trades = json.load(open(DATA / "trades.json"))
-    rankings_raw = json.load(open(DATA / "rankings.json"))
+    trades = read_json(DATA / "trades.json")
+    rankings_raw = read_json(DATA / "rankings.json")
     rankings = rankings_raw if isinstance(rankings_raw, list) else rankings_raw.get("rankings", [])
 
     # Build rank lookup
@@ -328,8 +400,9 @@ def main():
         rank_map[normalize(name)] = r.get("rank", 999)
 
     # Build historical stats
-    historical = build_historical_stats()
+    historical = build_historical_stats(pretty=args.pretty)
     print(f"\nHistorical stats loaded for {len(historical)} seasons")
+    fpg_table = build_fpg_table(historical)
 
     # Grade each trade
     trade_grades = []
@@ -432,15 +505,14 @@ def main():
                 norm_name = normalize(player_name)
 
                 # Get pre-trade stats (the season of the trade)
-                pre_stats = get_player_stats_for_season(historical, player_name, season)
-                pre_fpg = compute_fantasy_points(pre_stats) if pre_stats else None
+                entry = get_player_stats_for_season(fpg_table, player_name, season)
+                pre_fpg, pre_stats = entry or (None, None)
 
                 # Get post-trade stats (the NEXT season)
-                post_stats = None
-                post_fpg = None
+                post_fpg, post_stats = None, None
                 if post_season:
-                    post_stats = get_player_stats_for_season(historical, player_name, post_season)
-                    post_fpg = compute_fantasy_points(post_stats) if post_stats else None
+                    entry = get_player_stats_for_season(fpg_table, player_name, post_season)
+                    post_fpg, post_stats = entry or (None, None)
 
                 # Compute delta
                 delta = None
@@ -473,8 +545,8 @@ def main():
                     "pre_fpg": pre_fpg,
                     "post_fpg": post_fpg,
                     "delta": delta,
-                    "pre_ppg": pre_stats.get("ppg") if pre_stats else None,
-                    "post_ppg": post_stats.get("ppg") if post_stats else None,
+                    "pre_ppg": pre_stats.ppg if pre_stats else None,
+                    "post_ppg": post_stats.ppg if post_stats else None,
                     "dynasty_rank": rank,
                     "status": status,
                 })
@@ -571,8 +643,7 @@ def main():
     }
 
     output_path = DATA / "trade_grades.json"
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    save_json(output_path, output, pretty=args.pretty)
     print(f"\n{'='*60}")
     print(f"RESULTS")
     print(f"{'='*60}")